@@ -0,0 +1,65 @@
+import argparse
+import random
+import sys
+import threading
+import time
+import typing as t
+
+from joystick import SyncCacheInterface
+from joystick import SyncClockCache
+from joystick import SyncInMemoryCache
+
+# Measures the throughput of the read-heavy workload on the in-process caches shared by 1-64
+# threads. The results depend on the interpreter: with the GIL the threads don't run in parallel,
+# so the benchmark mostly shows the cost of the locking, while the free-threaded builds also show
+# the contention
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--operations", type=int, default=400_000)
+parser.add_argument("--keys", type=int, default=2000)
+parser.add_argument("--write-ratio", type=float, default=0.05)
+args = parser.parse_args()
+
+THREADS = (1, 2, 4, 8, 16, 32, 64)
+
+caches: t.Dict[str, t.Callable[[], SyncCacheInterface]] = {
+    "InMemoryCache(stripes=1)": lambda: SyncInMemoryCache(max_entries=1024, stripes=1),
+    "InMemoryCache": lambda: SyncInMemoryCache(max_entries=1024),
+    "ClockCache": lambda: SyncClockCache(max_entries=1024),
+}
+
+
+def run(cache: SyncCacheInterface, threads: int) -> float:
+    operations = args.operations // threads
+    start = threading.Barrier(threads + 1)
+
+    def work(seed: int) -> None:
+        rng = random.Random(seed)
+        # Skewed popularity of the keys, as with the real configs
+        keys = [
+            "key%d" % min(int(rng.expovariate(5 / args.keys)), args.keys)
+            for _ in range(operations)
+        ]
+        writes = [rng.random() < args.write_ratio for _ in range(operations)]
+        start.wait()
+        for key, write in zip(keys, writes):
+            if write or cache.get(key) is None:
+                cache.set(key, {"enabled": True}, cache_expiration_seconds=60)
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    started_at = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return operations * threads / (time.perf_counter() - started_at)
+
+
+sys.stdout.write("%-26s" % "threads" + "".join("%10d" % n for n in THREADS) + "\n")
+for name, make_cache in caches.items():
+    sys.stdout.write("%-26s" % name)
+    for threads in THREADS:
+        sys.stdout.write("%10.0f" % (run(make_cache(), threads) / 1000))
+        sys.stdout.flush()
+    sys.stdout.write("  k ops/s\n")
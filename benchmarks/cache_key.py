@@ -0,0 +1,64 @@
+import sys
+import timeit
+import typing as t
+
+import httpx
+
+from joystick import Client
+
+# Compares the cache hits of `get_contents` when the cache key is built from scratch on every call
+# (as before the builder was reused) with the hits which reuse the builder of the client context
+
+NUMBER = 20_000
+
+content_ids = {"feature-flags", "pricing", "onboarding"}
+
+params_sets: t.Dict[str, t.Dict[str, t.Any]] = {
+    "3 flat params": {"country": "US", "platform": "ios", "version": 42},
+    "30 nested params": dict(
+        (
+            "param_%d" % i,
+            (
+                {"values": list(range(5)), "enabled": i % 2 == 0}
+                if i % 3 == 0
+                else ["tag_%d" % j for j in range(3)]
+            ),
+        )
+        for i in range(30)
+    ),
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, json=dict((cid, {"data": {"enabled": True}}) for cid in content_ids)
+    )
+
+
+for params_name, params in params_sets.items():
+    client = Client(
+        api_key="a" * 32,
+        user_id="user-123",
+        params=params,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    client.get_contents(content_ids)
+
+    def from_scratch() -> None:
+        client._Client__reset_cache_key_builder()  # type: ignore[attr-defined]
+        client.get_contents(content_ids)
+
+    def reused_builder() -> None:
+        client.get_contents(content_ids)
+
+    for name, fn in (
+        ("from scratch", from_scratch),
+        ("reused builder", reused_builder),
+    ):
+        seconds = min(timeit.repeat(fn, number=NUMBER, repeat=5))
+        sys.stdout.write(
+            "%-18s %-16s %.2f us per hit\n"
+            % (params_name, name, seconds / NUMBER * 1_000_000)
+        )
+
+    client.close()
@@ -0,0 +1,103 @@
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from joystick import SyncTransport
+from joystick._sync.transport import get_supported_encodings
+
+# Fetches a large config from a local stub server, which emulates a link with the given bandwidth,
+# with every response encoding supported by the installed libraries
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--contents", type=int, default=20)
+parser.add_argument("--bandwidth-mbps", type=float, default=50)
+parser.add_argument("--requests", type=int, default=10)
+args = parser.parse_args()
+
+config = dict(
+    (
+        "cid%d" % i,
+        {
+            "data": {
+                "flags": dict(("flag_%d" % j, j % 3 == 0) for j in range(500)),
+                "segments": [{"id": j, "name": "segment %d" % j} for j in range(500)],
+            }
+        },
+    )
+    for i in range(args.contents)
+)
+body = json.dumps(config).encode("utf-8")
+
+encoders: t.Dict[str, t.Callable[[bytes], bytes]] = {
+    "identity": lambda content: content,
+    "gzip": lambda content: gzip.compress(content, compresslevel=6),
+}
+if "br" in get_supported_encodings():
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        import brotlicffi as brotli  # type: ignore
+
+    encoders["br"] = lambda content: t.cast(bytes, brotli.compress(content, quality=5))
+if "zstd" in get_supported_encodings():
+    import zstandard  # type: ignore
+
+    encoders["zstd"] = lambda content: t.cast(
+        bytes, zstandard.ZstdCompressor(level=3).compress(content)
+    )
+
+encoded_bodies = dict((name, encode(body)) for name, encode in encoders.items())
+bytes_per_second = args.bandwidth_mbps * 1_000_000 / 8
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        encoding = self.headers.get("Accept-Encoding", "identity").split(",")[0].strip()
+        content = encoded_bodies[encoding]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+
+        # Emulate the bandwidth of the link
+        chunk_size = 64 * 1024
+        for offset in range(0, len(content), chunk_size):
+            end = offset + chunk_size
+            chunk = content[offset:end]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bytes_per_second)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = "http://127.0.0.1:%d/" % server.server_address[1]
+
+sys.stdout.write(
+    "%d bytes of JSON, %.0f Mbit/s link\n" % (len(body), args.bandwidth_mbps)
+)
+for encoding, encoded_body in encoded_bodies.items():
+    with SyncTransport(api_key="api key", accept_encoding=[encoding]) as transport:
+        started_at = time.perf_counter()
+        for _ in range(args.requests):
+            assert transport.make_request("POST", url, {}) == config
+        seconds = (time.perf_counter() - started_at) / args.requests
+
+    sys.stdout.write(
+        "%-9s %9d bytes %8.1f ms per request\n"
+        % (encoding, len(encoded_body), seconds * 1000)
+    )
+
+server.shutdown()
@@ -1,14 +1,15 @@
-import json
 import typing as t
 
 from redis.asyncio import Redis as AsyncRedis
 
 from joystick._async.cache.cache import AsyncCacheInterface
+from joystick.json_codec import get_default_json_codec
 
 
 class RedisCache(AsyncCacheInterface):
     def __init__(self, host: str, port: int, password: str) -> None:
         self.__redis = AsyncRedis(host=host, port=port, password=password, db=0)
+        self.__json_codec = get_default_json_codec()
 
     async def get(self, key: str) -> t.Optional[t.Any]:
         result = await self.__redis.get(key)
@@ -17,11 +18,11 @@ class RedisCache(AsyncCacheInterface):
             return None
         else:
             print("RedisCache: key found: " + key)
-            return json.loads(result)
+            return self.__json_codec.loads(result)
 
     async def set(self, key: str, value: t.Any, cache_expiration_seconds: int) -> None:
         await self.__redis.set(
-            key, value=json.dumps(value), ex=cache_expiration_seconds
+            key, value=self.__json_codec.dumps(value), ex=cache_expiration_seconds
         )
 
     async def clear(self) -> None:
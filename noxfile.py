@@ -4,7 +4,14 @@ import re
 import nox
 
 SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
-SOURCE_FILES = ("setup.py", "noxfile.py", "utils/", "src/", "examples/")
+SOURCE_FILES = (
+    "setup.py",
+    "noxfile.py",
+    "utils/",
+    "src/",
+    "examples/",
+    "benchmarks/",
+)
 
 
 @nox.session(
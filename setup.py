@@ -78,5 +78,10 @@ setup(
     ],
     python_requires=">=3.6",
     install_requires=["httpx[http2]>=0.23.3,<1.0", "pylru>=1.2.1,<2.0.0"],
-    extras_require={"dev": ["nox", "wheel"]},
+    extras_require={
+        "dev": ["nox", "wheel"],
+        "orjson": ["orjson>=3.6,<4"],
+        "msgspec": ["msgspec>=0.18,<1"],
+        "compression": ["brotli", "zstandard>=0.18", "httpx>=0.27"],
+    },
 )
@@ -1,8 +1,53 @@
 __version__ = "0.1.0-alpha.1"
 
 from ._async.cache.cache import AsyncCacheInterface
+from ._async.cache.clock import ClockCache as AsyncClockCache
+from ._async.cache.file import FileCache as AsyncFileCache
+from ._async.cache.in_memory import InMemoryCache as AsyncInMemoryCache
+from ._async.cache.shared_memory import SharedMemoryCache as AsyncSharedMemoryCache
 from ._async.client import AsyncClient as AsyncClient
+from ._async.content_handle import AsyncContentHandle
+from ._async.transport import AsyncTransport
 from ._sync.cache.cache import SyncCacheInterface
+from ._sync.cache.clock import ClockCache as SyncClockCache
+from ._sync.cache.file import FileCache as SyncFileCache
+from ._sync.cache.in_memory import InMemoryCache as SyncInMemoryCache
+from ._sync.cache.shared_memory import SharedMemoryCache as SyncSharedMemoryCache
 from ._sync.client import Client as Client
+from ._sync.content_handle import SyncContentHandle
+from ._sync.transport import SyncTransport
+from .circuit_breaker import CircuitBreaker
+from .frozen import FrozenDict
+from .json_codec import JsonCodecInterface
+from .json_codec import MsgspecCodec
+from .json_codec import OrjsonCodec
+from .json_codec import StandardJsonCodec
+from .local_evaluation import LocalEvaluatorInterface
+from .retry import RetryPolicy
 
-__all__ = ["AsyncClient", "AsyncCacheInterface", "Client", "SyncCacheInterface"]
+__all__ = [
+    "AsyncClient",
+    "AsyncContentHandle",
+    "AsyncCacheInterface",
+    "AsyncClockCache",
+    "AsyncFileCache",
+    "AsyncInMemoryCache",
+    "AsyncSharedMemoryCache",
+    "AsyncTransport",
+    "CircuitBreaker",
+    "Client",
+    "FrozenDict",
+    "JsonCodecInterface",
+    "LocalEvaluatorInterface",
+    "MsgspecCodec",
+    "OrjsonCodec",
+    "RetryPolicy",
+    "StandardJsonCodec",
+    "SyncCacheInterface",
+    "SyncClockCache",
+    "SyncContentHandle",
+    "SyncFileCache",
+    "SyncInMemoryCache",
+    "SyncSharedMemoryCache",
+    "SyncTransport",
+]
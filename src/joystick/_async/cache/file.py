@@ -0,0 +1,200 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import typing as t
+from time import time
+
+import pylru  # type: ignore
+
+from joystick._concurrency import async_run_blocking
+from joystick.json_codec import JsonCodecInterface
+from joystick.json_codec import get_default_json_codec
+
+from .cache import AsyncCacheInterface
+
+SAFE_KEY_REGEX = re.compile(r"^[A-Za-z0-9_\-]{1,128}$")
+FILE_SUFFIX = ".json"
+MAX_PARSED_ENTRIES = 1000
+
+
+def file_name_for_key(key: str) -> str:
+    if SAFE_KEY_REGEX.match(key):
+        return key
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class FileCache(AsyncCacheInterface):
+    # Every entry is stored in its own file and replaced atomically, so the cache survives restarts
+    # and the directory can be shared by multiple processes (e.g. pre-forked workers).
+    # The expired entries are kept as the snapshot of the last known good results, the oldest
+    # written entries are removed when the directory exceeds the limits after a write
+    def __init__(
+        self,
+        directory: str,
+        read_only: bool = False,
+        json_codec: t.Optional[JsonCodecInterface] = None,
+        max_entries: int = 1000,
+        max_bytes: t.Optional[int] = None,
+    ) -> None:
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("Max entries should be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 1):
+            raise ValueError("Max bytes should be either None, or a positive integer")
+
+        self.__directory = directory
+        self.__read_only = read_only
+        self.__json_codec = (
+            json_codec if json_codec is not None else get_default_json_codec()
+        )
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        # Parsed entries by the version of their file, so an unchanged file is not parsed again on
+        # every read
+        self.__parsed = pylru.lrucache(min(max_entries, MAX_PARSED_ENTRIES))
+        self.__parsed_lock = threading.Lock()
+
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+
+    async def get(self, key: str) -> t.Optional[t.Any]:
+        entry = await async_run_blocking(self.__read, self.__path(key))
+        if entry is None:
+            return None
+
+        value, expire_at = entry
+        if time() > expire_at:
+            return None
+        return value
+
+    async def get_expired(self, key: str) -> t.Optional[t.Any]:
+        entry = await async_run_blocking(self.__read, self.__path(key))
+        if entry is None:
+            return None
+        return entry[0]
+
+    async def set(self, key: str, value: t.Any, cache_expiration_seconds: int) -> None:
+        expire_at = time() + cache_expiration_seconds
+
+        if self.__read_only:
+            # The entry is kept in memory until the file changes, otherwise every call would
+            # refresh the stale entry which can't be stored
+            await async_run_blocking(
+                self.__remember, self.__path(key), value, expire_at
+            )
+            return
+
+        content = self.__json_codec.dumps({"expire_at": expire_at, "value": value})
+        if self.__max_bytes is not None and len(content) > self.__max_bytes:
+            # The entry would evict everything else, don't cache it at all
+            return
+
+        await async_run_blocking(self.__write, self.__path(key), content)
+
+    async def clear(self) -> None:
+        if self.__read_only:
+            return
+
+        await async_run_blocking(self.__remove_all)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.__directory, file_name_for_key(key) + FILE_SUFFIX)
+
+    def __get_version(self, path: str) -> t.Optional[t.Tuple[int, int, int]]:
+        # The files are replaced, not rewritten, so the inode changes on every write
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def __read(self, path: str) -> t.Optional[t.Tuple[t.Any, float]]:
+        version = self.__get_version(path)
+        with self.__parsed_lock:
+            parsed = self.__parsed.get(path)
+        if parsed is not None and parsed[0] == version:
+            return t.cast(t.Tuple[t.Any, float], parsed[1])
+        if version is None:
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                content = self.__json_codec.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            # The file is removed or corrupted, treat it as a cache miss
+            return None
+
+        entry = (content["value"], content["expire_at"])
+        with self.__parsed_lock:
+            self.__parsed[path] = (version, entry)
+        return entry
+
+    def __remember(self, path: str, value: t.Any, expire_at: float) -> None:
+        version = self.__get_version(path)
+        with self.__parsed_lock:
+            self.__parsed[path] = (version, (value, expire_at))
+
+    def __write(self, path: str, content: bytes) -> None:
+        # Write to a temporary file and rename it, so the readers never see a partially written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self.__evict()
+
+    def __evict(self) -> None:
+        file_names = [
+            file_name
+            for file_name in os.listdir(self.__directory)
+            if file_name.endswith(FILE_SUFFIX)
+        ]
+        if self.__max_bytes is None and len(file_names) <= self.__max_entries:
+            return
+
+        files = []
+        for file_name in file_names:
+            path = os.path.join(self.__directory, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+
+        # The oldest written entries are removed first, with the same expiration time they're also
+        # the first to expire
+        files.sort()
+        entries = len(files)
+        size_bytes = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if entries <= self.__max_entries and (
+                self.__max_bytes is None or size_bytes <= self.__max_bytes
+            ):
+                break
+            self.__remove(path)
+            entries -= 1
+            size_bytes -= size
+
+    def __remove(self, path: str) -> None:
+        with self.__parsed_lock:
+            if path in self.__parsed:
+                del self.__parsed[path]
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def __remove_all(self) -> None:
+        with self.__parsed_lock:
+            self.__parsed.clear()
+        for file_name in os.listdir(self.__directory):
+            if file_name.endswith(FILE_SUFFIX):
+                try:
+                    os.unlink(os.path.join(self.__directory, file_name))
+                except FileNotFoundError:
+                    pass
@@ -1,29 +1,152 @@
+import sys
 import typing as t
+from collections import OrderedDict
 from time import time
 
-import pylru  # type: ignore
+from joystick._concurrency import AsyncCriticalSection
+from joystick.json_codec import get_default_json_codec
 
 from .cache import AsyncCacheInterface
 
 
+class CacheStats(t.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+def estimate_size(value: t.Any) -> int:
+    # The length of the serialized value is a good estimation for the JSON-like contents
+    try:
+        return len(get_default_json_codec().dumps(value))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class _Stripe:
+    def __init__(self, max_entries: int, max_bytes: t.Optional[int]) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = AsyncCriticalSection()
+        # Least recently used entries go first: (value, expire_at, size)
+        self.entries: "OrderedDict[str, t.Tuple[t.Any, float, int]]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def remove(self, key: str) -> None:
+        _, _, size = self.entries.pop(key)
+        self.size_bytes -= size
+
+
+def _split(total: int, parts: int, index: int) -> int:
+    return total // parts + (index < total % parts)
+
+
 class InMemoryCache(AsyncCacheInterface):
-    def __init__(self) -> None:
-        # Magic number, use your implementation if you need another value for the maximum number of
-        # elements
-        self.__cache = pylru.lrucache(1000)
+    # The entries can be split by key into stripes, each with its own LRU order and lock, so the
+    # threads working with different stripes don't wait for each other. The limits are split
+    # between the stripes evenly, so the eviction order is LRU within a stripe only, and a stripe
+    # may evict its entries while the others still have room
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: t.Optional[int] = None,
+        stripes: int = 1,
+    ) -> None:
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("Max entries should be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 1):
+            raise ValueError("Max bytes should be either None, or a positive integer")
+        if (
+            not isinstance(stripes, int)
+            or stripes < 1
+            or stripes > max_entries
+            or (max_bytes is not None and stripes > max_bytes)
+        ):
+            raise ValueError(
+                "Stripes should be a positive integer not greater than the limits"
+            )
+
+        self.__max_bytes = max_bytes
+        self.__stripes = [
+            _Stripe(
+                max_entries=_split(max_entries, stripes, i),
+                max_bytes=(
+                    _split(max_bytes, stripes, i) if max_bytes is not None else None
+                ),
+            )
+            for i in range(stripes)
+        ]
 
     async def get(self, key: str) -> t.Optional[t.Any]:
-        if key in self.__cache:
-            value, expire_at = self.__cache[key]
+        stripe = self.__get_stripe(key)
+
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                stripe.misses += 1
+                return None
+
+            value, expire_at, _ = entry
             if time() > expire_at:
-                del self.__cache[key]
+                stripe.remove(key)
+                stripe.misses += 1
                 return None
+
+            stripe.entries.move_to_end(key)
+            stripe.hits += 1
             return value
-        return None
 
     async def set(self, key: str, value: t.Any, cache_expiration_seconds: int) -> None:
+        stripe = self.__get_stripe(key)
         expire_at = time() + cache_expiration_seconds
-        self.__cache[key] = (value, expire_at)
+        # The size is estimated only when the cache is bounded by size, and outside of the lock
+        size = estimate_size(value) if self.__max_bytes is not None else 0
+
+        with stripe.lock:
+            if key in stripe.entries:
+                stripe.remove(key)
+
+            if stripe.max_bytes is not None and size > stripe.max_bytes:
+                # The entry would evict everything else, don't cache it at all
+                return
+
+            stripe.entries[key] = (value, expire_at, size)
+            stripe.size_bytes += size
+
+            while len(stripe.entries) > stripe.max_entries or (
+                stripe.max_bytes is not None and stripe.size_bytes > stripe.max_bytes
+            ):
+                stripe.remove(next(iter(stripe.entries)))
+                stripe.evictions += 1
 
     async def clear(self) -> None:
-        self.__cache.clear()
+        for stripe in self.__stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.size_bytes = 0
+
+    def get_stats(self) -> CacheStats:
+        hits = misses = evictions = entries = size_bytes = 0
+        for stripe in self.__stripes:
+            with stripe.lock:
+                hits += stripe.hits
+                misses += stripe.misses
+                evictions += stripe.evictions
+                entries += len(stripe.entries)
+                size_bytes += stripe.size_bytes
+
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            evictions=evictions,
+            entries=entries,
+            size_bytes=size_bytes,
+        )
+
+    def __get_stripe(self, key: str) -> _Stripe:
+        return self.__stripes[hash(key) % len(self.__stripes)]
@@ -0,0 +1,17 @@
+import typing as t
+
+# Marker which distinguishes the entries with metadata from the plain results, stored by the client
+# when no metadata is required
+ENTRY_MARKER = "__joystick_cache_entry__"
+
+
+def wrap_cache_entry(*, value: t.Any, fresh_until: float) -> t.Dict[str, t.Any]:
+    return {ENTRY_MARKER: 1, "value": value, "fresh_until": fresh_until}
+
+
+# Returns the stored value and the moment until which it's considered fresh. `None` as the moment
+# means the entry has no metadata, so it's fresh as long as the cache returns it
+def unwrap_cache_entry(raw: t.Any) -> t.Tuple[t.Any, t.Optional[float]]:
+    if isinstance(raw, dict) and raw.get(ENTRY_MARKER) == 1:
+        return raw["value"], raw["fresh_until"]
+    return raw, None
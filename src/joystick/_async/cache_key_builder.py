@@ -5,13 +5,59 @@ import typing as t
 from .params_dict import ParamsDict
 
 
+class CacheKeyBuilder:
+    # Hashes the segments which are the same for every call of the client once, and then only the
+    # segments of the call. The keys are the same as the ones built by `build_cache_key`
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        sem_ver: str,
+        user_id: t.Optional[str],
+        params: ParamsDict,
+        key_params: t.Optional[t.FrozenSet[str]] = None,
+    ) -> None:
+        # The client replaces the builder when its context changes, except for the changes of the
+        # params in place, which are tracked by their version
+        self.__params_version = params.version
+
+        # Only the params which affect the contents are part of the key, if they're known
+        params_sorted = sorted(
+            (
+                param
+                for param in params.items()
+                if key_params is None or param[0] in key_params
+            ),
+            key=lambda p: p[0],
+        )
+        encoded_prefix = json.dumps([api_key, params_sorted, sem_ver, user_id])
+
+        # Without the closing bracket, so the call segments can be appended to the list
+        self.__prefix_hash = hashlib.sha256(encoded_prefix[:-1].encode("utf-8"))
+
+    @property
+    def params_version(self) -> int:
+        return self.__params_version
+
+    def build(self, additional_segments: t.List[t.Any]) -> str:
+        key_hash = self.__prefix_hash.copy()
+        if len(additional_segments) != 0:
+            # "[a, b]" -> ", a, b]", same separators as used for the whole list
+            key_hash.update(b", ")
+            key_hash.update(json.dumps(additional_segments)[1:].encode("utf-8"))
+        else:
+            key_hash.update(b"]")
+
+        return key_hash.hexdigest()
+
+
 def build_cache_key(
     *,
     api_key: str,
     sem_ver: str,
     user_id: str,
     params: ParamsDict,
-    additional_segments: t.List[t.Any]
+    additional_segments: t.List[t.Any],
 ) -> str:
     params_sorted = sorted(params.items(), key=lambda p: p[0])
 
@@ -1,21 +1,181 @@
+import gzip
+import hashlib
+import importlib.util
 import typing as t
 
 import httpx
 
+from joystick._concurrency import AsyncCancelledError
+from joystick._concurrency import async_sleep
+from joystick.circuit_breaker import CircuitBreaker
 from joystick.errors import BadRequestError
+from joystick.errors import CircuitOpenError
 from joystick.errors import ServerError
 from joystick.errors import UnknownError
 from joystick.errors.api import ApiHttpError
+from joystick.json_codec import JsonCodecInterface
+from joystick.json_codec import get_default_json_codec
+from joystick.retry import RetryBudget
+from joystick.retry import RetryPolicy
+
+# Same defaults as `httpx` uses
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+DEFAULT_TIMEOUT = httpx.Timeout(5.0)
+# Smaller bodies don't get smaller with compression
+COMPRESSION_MIN_BYTES = 1024
+
+
+class ConditionalResponse(t.NamedTuple):
+    # `data` is not decoded when the content is not modified since the provided ETag or hash
+    not_modified: bool
+    data: t.Any
+    etag: t.Optional[str]
+    content_hash: str
+
+
+def hash_content(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def get_supported_encodings() -> t.List[str]:
+    # `httpx` decodes "br" and "zstd" when the optional libraries are installed (see the
+    # `compression` extra)
+    encodings = ["identity", "gzip", "deflate"]
+    if any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi")):
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard"):
+        encodings.append("zstd")
+    return encodings
 
 
 class AsyncTransport:
-    def __init__(self, api_key: str):
-        self.__client = httpx.AsyncClient()
+    def __init__(
+        self,
+        api_key: t.Optional[str] = None,
+        http_client: t.Optional[httpx.AsyncClient] = None,
+        http2: bool = False,
+        limits: t.Optional[httpx.Limits] = None,
+        timeout: t.Optional[httpx.Timeout] = None,
+        retry_policy: t.Optional[RetryPolicy] = None,
+        circuit_breaker: t.Optional[CircuitBreaker] = None,
+        json_codec: t.Optional[JsonCodecInterface] = None,
+        accept_encoding: t.Optional[t.Sequence[str]] = None,
+        compress_request_body: bool = False,
+    ):
+        if accept_encoding is not None:
+            if len(accept_encoding) == 0:
+                raise ValueError("Accept encoding should be either None, or non-empty")
+            supported_encodings = get_supported_encodings()
+            for encoding in accept_encoding:
+                if encoding not in supported_encodings:
+                    raise ValueError(
+                        'Encoding "%s" is not supported, supported encodings: %s'
+                        % (encoding, ", ".join(supported_encodings))
+                    )
+        assert isinstance(compress_request_body, bool)
+
+        if http_client is not None:
+            if http2 or limits is not None or timeout is not None:
+                raise ValueError(
+                    "HTTP/2, limits and timeout should be configured on the provided HTTP client"
+                )
+            self.__client = http_client
+            self.__owns_client = False
+        else:
+            self.__client = httpx.AsyncClient(
+                http2=http2,
+                limits=limits if limits is not None else DEFAULT_LIMITS,
+                timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+            )
+            self.__owns_client = True
         self.__api_key = api_key
+        self.__retry_policy = retry_policy
+        self.__circuit_breaker = circuit_breaker
+        # By default, `httpx` accepts all the encodings it supports
+        self.__accept_encoding = (
+            ", ".join(accept_encoding) if accept_encoding is not None else None
+        )
+        self.__compress_request_body = compress_request_body
+        self.__json_codec = (
+            json_codec if json_codec is not None else get_default_json_codec()
+        )
+        # The budget is shared by all the requests made via this transport
+        self.__retry_budget = (
+            RetryBudget(retry_policy) if retry_policy is not None else None
+        )
 
     async def make_request(
-        self, http_method: str, url: str, body: t.Optional[t.Any]
+        self,
+        http_method: str,
+        url: str,
+        body: t.Optional[t.Any],
+        api_key: t.Optional[str] = None,
     ) -> t.Any:
+        response = await self.__request(http_method, url, body, api_key, {})
+
+        if response.status_code != 200:
+            raise self.map_response_to_error(response)
+
+        return self.__json_codec.loads(response.content)
+
+    async def make_conditional_request(
+        self,
+        http_method: str,
+        url: str,
+        body: t.Optional[t.Any],
+        api_key: t.Optional[str] = None,
+        etag: t.Optional[str] = None,
+        content_hash: t.Optional[str] = None,
+    ) -> ConditionalResponse:
+        # Joystick API can answer "304 Not Modified" to the ETag of the previous response. Otherwise
+        # the hash of the content tells if it's changed, so the unchanged content isn't decoded
+        response = await self.__request(
+            http_method,
+            url,
+            body,
+            api_key,
+            {"If-None-Match": etag} if etag is not None else {},
+        )
+
+        if (
+            response.status_code == 304
+            and etag is not None
+            and content_hash is not None
+        ):
+            return ConditionalResponse(
+                not_modified=True,
+                data=None,
+                etag=response.headers.get("etag", etag),
+                content_hash=content_hash,
+            )
+
+        if response.status_code != 200:
+            raise self.map_response_to_error(response)
+
+        response_content_hash = hash_content(response.content)
+        if response_content_hash == content_hash:
+            return ConditionalResponse(
+                not_modified=True,
+                data=None,
+                etag=response.headers.get("etag"),
+                content_hash=content_hash,
+            )
+
+        return ConditionalResponse(
+            not_modified=False,
+            data=self.__json_codec.loads(response.content),
+            etag=response.headers.get("etag"),
+            content_hash=response_content_hash,
+        )
+
+    async def __request(
+        self,
+        http_method: str,
+        url: str,
+        body: t.Optional[t.Any],
+        api_key: t.Optional[str],
+        additional_headers: t.Dict[str, str],
+    ) -> httpx.Response:
         # callable: t.Optional[(url: str): t.Coroutine[t.Any, t.Any, httpx.Response]] = None
         if http_method == "POST":
             callable = self.__client.post
@@ -24,17 +184,113 @@ class AsyncTransport:
         else:
             raise AssertionError("Invalid HTTP method is provided")
 
+        # The transport can be shared by clients with different API keys
+        api_key = api_key if api_key is not None else self.__api_key
+        if api_key is None:
+            raise AssertionError("API key is not provided")
+
         headers = {
-            "x-api-key": self.__api_key,
+            "x-api-key": api_key,
             "Content-Type": "application/json",
+            **additional_headers,
         }
+        if self.__accept_encoding is not None:
+            headers["Accept-Encoding"] = self.__accept_encoding
 
-        response = await callable(url=url, json=body, headers=headers)
+        # Fail fast while Joystick API is unavailable, instead of waiting for the timeouts
+        if (
+            self.__circuit_breaker is not None
+            and not self.__circuit_breaker.allow_request()
+        ):
+            raise CircuitOpenError(
+                "Joystick API is unavailable, the request was not sent"
+            )
 
-        if response.status_code != 200:
-            raise self.map_response_to_error(response)
+        # Encoded once, the same content is sent by all the attempts
+        content = self.__json_codec.dumps(body) if body is not None else None
+
+        # Only the content updates (PUT) can be large enough to benefit from the compression
+        if (
+            self.__compress_request_body
+            and http_method == "PUT"
+            and content is not None
+            and len(content) >= COMPRESSION_MIN_BYTES
+        ):
+            content = gzip.compress(content, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        try:
+            response = await self.__send(callable, url, content, headers)
+        except AsyncCancelledError:
+            raise
+        except Exception:
+            if self.__circuit_breaker is not None:
+                self.__circuit_breaker.record_failure()
+            raise
+
+        if self.__circuit_breaker is not None:
+            if response.status_code >= 500:
+                self.__circuit_breaker.record_failure()
+            else:
+                self.__circuit_breaker.record_success()
+
+        return response
+
+    async def __send(
+        self,
+        callable: t.Callable[..., t.Any],
+        url: str,
+        content: t.Optional[bytes],
+        headers: t.Dict[str, str],
+    ) -> httpx.Response:
+        if self.__retry_budget is not None:
+            self.__retry_budget.record_request()
+
+        attempt = 0
+        while True:
+            try:
+                response = await callable(url=url, content=content, headers=headers)
+            except Exception as e:
+                if not self.__should_retry(attempt, exception=e):
+                    raise
+            else:
+                if response.status_code == 200 or not self.__should_retry(
+                    attempt, status_code=response.status_code
+                ):
+                    return t.cast(httpx.Response, response)
+
+            assert self.__retry_policy is not None
+            await async_sleep(self.__retry_policy.get_backoff_seconds(attempt))
+            attempt += 1
+
+    def __should_retry(
+        self,
+        attempt: int,
+        status_code: t.Optional[int] = None,
+        exception: t.Optional[BaseException] = None,
+    ) -> bool:
+        policy = self.__retry_policy
+        if policy is None or self.__retry_budget is None:
+            return False
+        if attempt + 1 >= policy.max_attempts:
+            return False
+        if status_code is not None and not policy.is_retryable_status_code(status_code):
+            return False
+        if exception is not None and not policy.is_retryable_exception(exception):
+            return False
+
+        return self.__retry_budget.try_withdraw()
+
+    async def aclose(self) -> None:
+        # The provided HTTP client is closed by its owner
+        if self.__owns_client:
+            await self.__client.aclose()
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
 
-        return response.json()
+    async def __aexit__(self, *args: t.Any) -> None:
+        await self.aclose()
 
     def map_response_to_error(self, response: httpx.Response) -> ApiHttpError:
         status_code = response.status_code
@@ -0,0 +1,436 @@
+import asyncio
+import logging
+import threading
+import time
+import typing as t
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrency primitives which can't be generated by `unasync` from the `_async` code.
+# Every `Async*` class has a `Sync*` twin with the same interface, so the code in `_async`
+# refers to the `Async*` names and `unasync` rewrites them into `Sync*` for `_sync`. The same
+# applies to `async_*` and `sync_*` functions (see `utils/run-unasync.py`).
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+logger = logging.getLogger("joystick")
+
+
+async def async_sleep(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+def sync_sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def async_run_blocking(fn: t.Callable[..., T], *args: t.Any) -> T:
+    # Blocking calls (e.g. file system) are moved off the event loop
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+def sync_run_blocking(fn: t.Callable[..., T], *args: t.Any) -> T:
+    return fn(*args)
+
+
+# Before Python 3.8 `asyncio.CancelledError` is an `Exception`, so it's re-raised explicitly before
+# `except Exception`. Nothing cancels the sync code, so the sync twin is never raised
+AsyncCancelledError = asyncio.CancelledError
+
+
+class SyncCancelledError(BaseException):
+    pass
+
+
+class AsyncCriticalSection:
+    # The event loop runs one task at a time, so the code without `await` is atomic already
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args: t.Any) -> None:
+        pass
+
+
+class SyncCriticalSection:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+
+    def __enter__(self) -> None:
+        self.__lock.acquire()
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.__lock.release()
+
+
+async def async_map_bounded(
+    fn: t.Callable[[T], t.Awaitable[R]], items: t.Iterable[T], concurrency: int
+) -> t.AsyncIterator[t.Tuple[T, t.Optional[R], t.Optional[Exception]]]:
+    # Calls `fn` for the items with at most `concurrency` calls in progress, and yields the item with
+    # either the result or the error of its call, in the order of the items. The items are consumed
+    # lazily, so the memory usage stays flat
+    pending: "t.Deque[t.Tuple[T, asyncio.Future[R]]]" = deque()
+    try:
+        for item in items:
+            pending.append((item, asyncio.ensure_future(fn(item))))
+            if len(pending) >= concurrency:
+                yield await _async_settle(*pending.popleft())
+        while pending:
+            yield await _async_settle(*pending.popleft())
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+async def _async_settle(
+    item: T, task: "asyncio.Future[t.Any]"
+) -> t.Tuple[T, t.Any, t.Optional[Exception]]:
+    try:
+        return item, await task, None
+    except AsyncCancelledError:
+        raise
+    except Exception as e:
+        return item, None, e
+
+
+def sync_map_bounded(
+    fn: t.Callable[[T], R], items: t.Iterable[T], concurrency: int
+) -> t.Iterator[t.Tuple[T, t.Optional[R], t.Optional[Exception]]]:
+    pending: "t.Deque[t.Tuple[T, Future[R]]]" = deque()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        for item in items:
+            pending.append((item, executor.submit(fn, item)))
+            if len(pending) >= concurrency:
+                yield _sync_settle(*pending.popleft())
+        while pending:
+            yield _sync_settle(*pending.popleft())
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _sync_settle(
+    item: T, future: "Future[t.Any]"
+) -> t.Tuple[T, t.Any, t.Optional[Exception]]:
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, None, e
+
+
+class AsyncSingleFlight:
+    def __init__(self) -> None:
+        self.__in_flight: t.Dict[str, "asyncio.Future[t.Any]"] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self.__in_flight
+
+    async def do(self, key: str, fn: t.Callable[[], t.Awaitable[T]]) -> T:
+        in_flight = self.__in_flight.get(key)
+
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(fn())
+            self.__in_flight[key] = in_flight
+            in_flight.add_done_callback(lambda f: self.__forget(key, f))
+
+        # Shield the shared call, so cancellation of one of the callers doesn't cancel the call
+        # for everyone else
+        return t.cast(T, await asyncio.shield(in_flight))
+
+    async def aclose(self) -> None:
+        # The shared calls are shielded from their callers, so they are cancelled here
+        in_flight = list(self.__in_flight.values())
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+    def __forget(self, key: str, in_flight: "asyncio.Future[t.Any]") -> None:
+        if self.__in_flight.get(key) is in_flight:
+            del self.__in_flight[key]
+
+
+class _SyncCall:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: t.Any = None
+        self.error: t.Optional[BaseException] = None
+
+
+class SyncSingleFlight:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__in_flight: t.Dict[str, _SyncCall] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self.__in_flight
+
+    def do(self, key: str, fn: t.Callable[[], T]) -> T:
+        with self.__lock:
+            call = self.__in_flight.get(key)
+            is_leader = call is None
+            if call is None:
+                call = _SyncCall()
+                self.__in_flight[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return t.cast(T, call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+            call.done.set()
+
+        return t.cast(T, call.result)
+
+    def close(self) -> None:
+        # The shared calls run in the threads of their callers, which are waited for by
+        # `SyncBackgroundTasks.close`
+        pass
+
+
+class AsyncBackgroundTasks:
+    def __init__(self) -> None:
+        # Keep strong references to the running tasks, otherwise they may be garbage collected
+        # before completion
+        self.__tasks: t.Set["asyncio.Future[t.Any]"] = set()
+
+    def spawn(self, fn: t.Callable[[], t.Awaitable[t.Any]]) -> None:
+        task = asyncio.ensure_future(self.__run(fn))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __run(self, fn: t.Callable[[], t.Awaitable[t.Any]]) -> None:
+        try:
+            await fn()
+        except AsyncCancelledError:
+            raise
+        except Exception:
+            logger.warning("Joystick background task failed", exc_info=True)
+
+    async def aclose(self) -> None:
+        tasks = list(self.__tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class SyncBackgroundTasks:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__threads: t.Set[threading.Thread] = set()
+
+    def spawn(self, fn: t.Callable[[], t.Any]) -> None:
+        thread = threading.Thread(target=self.__run, args=(fn,), daemon=True)
+        with self.__lock:
+            self.__threads.add(thread)
+        thread.start()
+
+    def __run(self, fn: t.Callable[[], t.Any]) -> None:
+        try:
+            fn()
+        except Exception:
+            logger.warning("Joystick background task failed", exc_info=True)
+        finally:
+            with self.__lock:
+                self.__threads.discard(threading.current_thread())
+
+    def close(self) -> None:
+        # Threads can't be cancelled, wait for them to complete instead
+        with self.__lock:
+            threads = list(self.__threads)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+
+class AsyncPeriodicTask:
+    def __init__(
+        self,
+        fn: t.Callable[[], t.Awaitable[t.Any]],
+        interval: t.Callable[[], float],
+    ) -> None:
+        self.__fn = fn
+        self.__interval = interval
+        self.__task: t.Optional["asyncio.Future[None]"] = None
+
+    def is_running(self) -> bool:
+        return self.__task is not None and not self.__task.done()
+
+    def start(self) -> None:
+        if not self.is_running():
+            self.__task = asyncio.ensure_future(self.__run())
+
+    async def stop(self) -> None:
+        task, self.__task = self.__task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def __run(self) -> None:
+        while True:
+            await asyncio.sleep(self.__interval())
+            try:
+                await self.__fn()
+            except AsyncCancelledError:
+                raise
+            except Exception:
+                logger.warning("Joystick periodic task failed", exc_info=True)
+
+
+class SyncPeriodicTask:
+    def __init__(
+        self,
+        fn: t.Callable[[], t.Any],
+        interval: t.Callable[[], float],
+    ) -> None:
+        self.__fn = fn
+        self.__interval = interval
+        self.__thread: t.Optional[threading.Thread] = None
+        self.__stopped = threading.Event()
+
+    def is_running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self) -> None:
+        if not self.is_running():
+            self.__stopped = threading.Event()
+            self.__thread = threading.Thread(
+                target=self.__run, args=(self.__stopped,), daemon=True
+            )
+            self.__thread.start()
+
+    def stop(self) -> None:
+        thread, self.__thread = self.__thread, None
+        if thread is None:
+            return
+        self.__stopped.set()
+        if thread is not threading.current_thread():
+            thread.join()
+
+    def __run(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self.__interval()):
+            try:
+                self.__fn()
+            except Exception:
+                logger.warning("Joystick periodic task failed", exc_info=True)
+
+
+class _AsyncBatch:
+    def __init__(self) -> None:
+        self.items: t.Set[str] = set()
+        self.full = asyncio.Event()
+        self.task: t.Optional["asyncio.Future[t.Dict[str, t.Any]]"] = None
+
+
+class AsyncBatcher:
+    def __init__(
+        self,
+        fn: t.Callable[[t.Hashable, t.Set[str]], t.Awaitable[t.Dict[str, t.Any]]],
+    ) -> None:
+        self.__fn = fn
+        self.__pending: t.Dict[t.Hashable, _AsyncBatch] = {}
+
+    async def submit(
+        self, key: t.Hashable, item: str, window_seconds: float, max_size: int
+    ) -> t.Dict[str, t.Any]:
+        batch = self.__pending.get(key)
+
+        if batch is None:
+            batch = _AsyncBatch()
+            self.__pending[key] = batch
+            batch.task = asyncio.ensure_future(self.__run(key, batch, window_seconds))
+
+        batch.items.add(item)
+        if len(batch.items) >= max_size:
+            # The next caller starts a new batch
+            del self.__pending[key]
+            batch.full.set()
+
+        assert batch.task is not None
+        return await asyncio.shield(batch.task)
+
+    async def __run(
+        self, key: t.Hashable, batch: _AsyncBatch, window_seconds: float
+    ) -> t.Dict[str, t.Any]:
+        try:
+            await asyncio.wait_for(batch.full.wait(), window_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+        if self.__pending.get(key) is batch:
+            del self.__pending[key]
+
+        return await self.__fn(key, batch.items)
+
+
+class _SyncBatch:
+    def __init__(self) -> None:
+        self.items: t.Set[str] = set()
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.result: t.Dict[str, t.Any] = {}
+        self.error: t.Optional[BaseException] = None
+
+
+class SyncBatcher:
+    def __init__(
+        self,
+        fn: t.Callable[[t.Hashable, t.Set[str]], t.Dict[str, t.Any]],
+    ) -> None:
+        self.__fn = fn
+        self.__lock = threading.Lock()
+        self.__pending: t.Dict[t.Hashable, _SyncBatch] = {}
+
+    def submit(
+        self, key: t.Hashable, item: str, window_seconds: float, max_size: int
+    ) -> t.Dict[str, t.Any]:
+        with self.__lock:
+            batch = self.__pending.get(key)
+            is_leader = batch is None
+            if batch is None:
+                batch = _SyncBatch()
+                self.__pending[key] = batch
+
+            batch.items.add(item)
+            if len(batch.items) >= max_size:
+                # The next caller starts a new batch
+                del self.__pending[key]
+                batch.full.set()
+
+        if not is_leader:
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+            return batch.result
+
+        # The first caller waits for the others during the window and makes the call for everyone
+        batch.full.wait(window_seconds)
+
+        with self.__lock:
+            if self.__pending.get(key) is batch:
+                del self.__pending[key]
+
+        try:
+            batch.result = self.__fn(key, batch.items)
+        except BaseException as e:
+            batch.error = e
+            raise
+        finally:
+            batch.done.set()
+
+        return batch.result
@@ -15,3 +15,18 @@ class SyncCacheInterface(ABC):
     @abstractmethod
     def clear(self) -> None:
         pass
+
+    def get_expired(self, key: str) -> t.Optional[t.Any]:
+        # Called when the client falls back to the last known good result it doesn't have in
+        # memory. Override it if the cache keeps the expired entries (e.g. in files, which survive
+        # restarts), so they're served while Joystick API is unavailable
+        return None
+
+    def release(self, key: str) -> None:
+        # Called when the client failed to refresh the missing entry. Override it if the cache lets
+        # only one of the callers refresh the entry, so the others stop waiting for it
+        pass
+
+    def close(self) -> None:
+        # Override it if the cache should flush or release anything when the client is closed
+        pass
@@ -0,0 +1,133 @@
+import typing as t
+from time import time
+
+from joystick._concurrency import SyncCriticalSection
+
+from .cache import SyncCacheInterface
+from .in_memory import CacheStats
+from .in_memory import estimate_size
+
+
+class _ClockEntry:
+    __slots__ = ("key", "value", "expire_at", "size", "slot", "referenced")
+
+    def __init__(
+        self, key: str, value: t.Any, expire_at: float, size: int, slot: int
+    ) -> None:
+        self.key = key
+        self.value = value
+        self.expire_at = expire_at
+        self.size = size
+        self.slot = slot
+        self.referenced = False
+
+
+class ClockCache(SyncCacheInterface):
+    # Approximate LRU for read-heavy caches shared by many threads. The reads don't take the lock
+    # and don't reorder anything, they only mark the entry as referenced. The writes take the lock
+    # and evict with the "clock" algorithm: the hand sweeps the entries in a ring, clearing the
+    # marks, and evicts the first entry which wasn't referenced since the previous sweep.
+    # The hits and misses are counted without the lock, so they are approximate under contention
+    def __init__(
+        self, max_entries: int = 1000, max_bytes: t.Optional[int] = None
+    ) -> None:
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("Max entries should be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 1):
+            raise ValueError("Max bytes should be either None, or a positive integer")
+
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__lock = SyncCriticalSection()
+        self.__entries: t.Dict[str, _ClockEntry] = {}
+        self.__ring: t.List[t.Optional[_ClockEntry]] = []
+        self.__free_slots: t.List[int] = []
+        self.__hand = 0
+        self.__size_bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key: str) -> t.Optional[t.Any]:
+        entry = self.__entries.get(key)
+        # The expired entries are left for the hand, which evicts them first
+        if entry is None or time() > entry.expire_at:
+            self.__misses += 1
+            return None
+
+        # Don't write the shared entry if it's marked already
+        if not entry.referenced:
+            entry.referenced = True
+        self.__hits += 1
+        return entry.value
+
+    def set(self, key: str, value: t.Any, cache_expiration_seconds: int) -> None:
+        expire_at = time() + cache_expiration_seconds
+        # The size is estimated only when the cache is bounded by size, and outside of the lock
+        size = estimate_size(value) if self.__max_bytes is not None else 0
+
+        with self.__lock:
+            previous = self.__entries.get(key)
+            if previous is not None:
+                self.__remove(previous)
+
+            if self.__max_bytes is not None and size > self.__max_bytes:
+                # The entry would evict everything else, don't cache it at all
+                return
+
+            while len(self.__entries) >= self.__max_entries or (
+                self.__max_bytes is not None
+                and self.__size_bytes + size > self.__max_bytes
+            ):
+                self.__remove(self.__find_victim())
+                self.__evictions += 1
+
+            slot = self.__free_slots.pop() if self.__free_slots else len(self.__ring)
+            entry = _ClockEntry(key, value, expire_at, size, slot)
+            if slot == len(self.__ring):
+                self.__ring.append(entry)
+            else:
+                self.__ring[slot] = entry
+            self.__entries[key] = entry
+            self.__size_bytes += size
+
+    def clear(self) -> None:
+        with self.__lock:
+            # Replace the dict instead of clearing it in place, it may be used by the readers
+            self.__entries = {}
+            self.__ring = []
+            self.__free_slots = []
+            self.__hand = 0
+            self.__size_bytes = 0
+
+    def get_stats(self) -> CacheStats:
+        with self.__lock:
+            return CacheStats(
+                hits=self.__hits,
+                misses=self.__misses,
+                evictions=self.__evictions,
+                entries=len(self.__entries),
+                size_bytes=self.__size_bytes,
+            )
+
+    def __find_victim(self) -> _ClockEntry:
+        now = time()
+        # The readers may mark the entries again during the sweep, so after two full turns of the
+        # hand the next entry is evicted regardless of the mark
+        max_steps = 2 * len(self.__ring)
+        steps = 0
+        while True:
+            entry = self.__ring[self.__hand]
+            self.__hand = (self.__hand + 1) % len(self.__ring)
+            if entry is None:
+                continue
+            if not entry.referenced or now > entry.expire_at or steps >= max_steps:
+                return entry
+            entry.referenced = False
+            steps += 1
+
+    def __remove(self, entry: _ClockEntry) -> None:
+        del self.__entries[entry.key]
+        self.__ring[entry.slot] = None
+        self.__free_slots.append(entry.slot)
+        self.__size_bytes -= entry.size
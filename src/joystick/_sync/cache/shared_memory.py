@@ -0,0 +1,140 @@
+import os
+import tempfile
+import typing as t
+from time import time
+
+from joystick._concurrency import SyncCriticalSection
+from joystick._concurrency import sync_run_blocking
+from joystick._concurrency import sync_sleep
+from joystick.json_codec import JsonCodecInterface
+
+from .cache import SyncCacheInterface
+from .file import FileCache
+from .file import file_name_for_key
+
+# POSIX shared memory objects live in this directory on Linux
+SHARED_MEMORY_DIRECTORY = "/dev/shm"
+LEASE_SUFFIX = ".lease"
+
+
+class SharedMemoryCache(SyncCacheInterface):
+    # The entries are stored in the shared memory (tmpfs) of the host, so all the processes on the
+    # host (e.g. pre-forked workers) share one copy of every entry. On a cache miss, only one of the
+    # processes gets a lease to refresh the entry, others wait for the refreshed entry, up to
+    # `lease_seconds`. The memory is bounded by `max_entries` and `max_bytes` for the whole host
+    def __init__(
+        self,
+        name: str = "joystick",
+        lease_seconds: float = 10,
+        poll_interval_seconds: float = 0.01,
+        json_codec: t.Optional[JsonCodecInterface] = None,
+        max_entries: int = 1000,
+        max_bytes: t.Optional[int] = None,
+    ) -> None:
+        base_directory = (
+            SHARED_MEMORY_DIRECTORY
+            if os.path.isdir(SHARED_MEMORY_DIRECTORY)
+            else tempfile.gettempdir()
+        )
+        self.__directory = os.path.join(base_directory, name)
+        self.__storage = FileCache(
+            self.__directory,
+            json_codec=json_codec,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+        )
+        self.__lease_seconds = lease_seconds
+        self.__poll_interval_seconds = poll_interval_seconds
+        # The keys of the leases held by this instance
+        self.__leases: t.Set[str] = set()
+        self.__leases_lock = SyncCriticalSection()
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def get(self, key: str) -> t.Optional[t.Any]:
+        wait_until = time() + self.__lease_seconds
+
+        while True:
+            value = self.__storage.get(key)
+            if value is not None:
+                return value
+
+            # The caller which gets the lease is responsible for the refresh. The callers in this
+            # process don't wait for their own lease, the client refreshes the entry for them
+            with self.__leases_lock:
+                if key in self.__leases:
+                    return None
+            if sync_run_blocking(self.__try_acquire_lease, key):
+                # The previous holder may have stored the entry and released the lease since the
+                # entry was read
+                value = self.__storage.get(key)
+                if value is not None:
+                    sync_run_blocking(self.__release_lease, key)
+                    return value
+
+                with self.__leases_lock:
+                    self.__leases.add(key)
+                return None
+
+            if time() > wait_until:
+                return None
+
+            sync_sleep(self.__poll_interval_seconds)
+
+    def set(self, key: str, value: t.Any, cache_expiration_seconds: int) -> None:
+        self.__storage.set(key, value, cache_expiration_seconds)
+        self.release(key)
+
+    def release(self, key: str) -> None:
+        # The lease taken over by another process is not released
+        with self.__leases_lock:
+            if key not in self.__leases:
+                return
+            self.__leases.discard(key)
+        sync_run_blocking(self.__release_lease, key)
+
+    def clear(self) -> None:
+        self.__storage.clear()
+        with self.__leases_lock:
+            self.__leases.clear()
+        sync_run_blocking(self.__release_all_leases)
+
+    def __lease_path(self, key: str) -> str:
+        return os.path.join(self.__directory, file_name_for_key(key) + LEASE_SUFFIX)
+
+    def __try_acquire_lease(self, key: str) -> bool:
+        path = self.__lease_path(key)
+
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            pass
+        else:
+            os.close(fd)
+            return True
+
+        # The holder of the lease has probably failed to refresh the entry, take the lease over
+        try:
+            if time() - os.path.getmtime(path) > self.__lease_seconds:
+                os.utime(path)
+                return True
+        except FileNotFoundError:
+            pass
+
+        return False
+
+    def __release_lease(self, key: str) -> None:
+        try:
+            os.unlink(self.__lease_path(key))
+        except FileNotFoundError:
+            pass
+
+    def __release_all_leases(self) -> None:
+        for file_name in os.listdir(self.__directory):
+            if file_name.endswith(LEASE_SUFFIX):
+                try:
+                    os.unlink(os.path.join(self.__directory, file_name))
+                except FileNotFoundError:
+                    pass
@@ -1,17 +1,60 @@
+import copy
+import functools
 import json
+import random
 import re
 import typing as t
 import urllib.parse
+from time import time
 
+import httpx
+
+from joystick._concurrency import SyncBackgroundTasks
+from joystick._concurrency import SyncBatcher
+from joystick._concurrency import SyncCancelledError
+from joystick._concurrency import SyncCriticalSection
+from joystick._concurrency import SyncPeriodicTask
+from joystick._concurrency import SyncSingleFlight
+from joystick._concurrency import sync_map_bounded
+from joystick.circuit_breaker import CircuitBreaker
+from joystick.errors import CircuitOpenError
+from joystick.errors import ServerError
 from joystick.errors.api import MultipleContentsApiError
+from joystick.frozen import freeze
+from joystick.json_codec import JsonCodecInterface
+from joystick.local_evaluation import LocalEvaluatorInterface
+from joystick.retry import RetryPolicy
 
 from .cache.cache import SyncCacheInterface
 from .cache.in_memory import InMemoryCache
-from .cache_key_builder import build_cache_key
+from .cache_entry import unwrap_cache_entry
+from .cache_entry import wrap_cache_entry
+from .cache_key_builder import CacheKeyBuilder
+from .content_handle import SyncContentHandle
+from .lru_store import LruStore
 from .params_dict import ParamsDict
 from .transport import SyncTransport
 
 
+class ContentValidator(t.NamedTuple):
+    # What's known about the last response for the request, to tell if the next one is changed
+    etag: t.Optional[str]
+    content_hash: str
+    result: t.Dict[str, t.Any]
+
+
+class UserContents(t.NamedTuple):
+    user_id: str
+    params: t.Optional[t.Dict[str, t.Any]]
+    # Either the contents, or the error (only with `return_exceptions`)
+    contents: t.Optional[t.Dict[str, t.Any]]
+    error: t.Optional[Exception]
+
+
+# Errors which mean Joystick API is unavailable, so the last known good result can be served instead
+FALLBACK_ERRORS = (CircuitOpenError, ServerError, httpx.TransportError)
+
+
 class Client:
     # API KEY
     def get_api_key(self) -> str:
@@ -22,6 +65,7 @@ class Client:
             raise TypeError("API key should be a valid non-empty string")
 
         self.__api_key = api_key
+        self.__reset_cache_key_builder()
 
     api_key = property(get_api_key, set_api_key)
 
@@ -32,6 +76,7 @@ class Client:
     def set_user_id(self, user_id: str) -> None:
         assert isinstance(user_id, str)
         self.__user_id = user_id
+        self.__reset_cache_key_builder()
 
     user_id = property(get_user_id, set_user_id)
 
@@ -43,10 +88,41 @@ class Client:
     def set_params(self, params: t.Dict[str, t.Any]) -> None:
         if not isinstance(params, dict):
             raise ValueError("Params should be a valid dictionary")
-        self.__params = ParamsDict(params)
+        # A snapshot, so the changes of the nested values of the provided dictionary don't affect
+        # the client. The nested values of `client.params` shouldn't be changed in place either,
+        # the cache key follows only the changes of `client.params` itself
+        self.__params = ParamsDict(copy.deepcopy(params))
+        self.__reset_cache_key_builder()
 
     params = property(get_params, set_params)
 
+    # CACHE KEY PARAMS
+    def get_cache_key_params(self) -> t.Optional[t.FrozenSet[str]]:
+        return self.__cache_key_params
+
+    def set_cache_key_params(
+        self, cache_key_params: t.Optional[t.Iterable[str]]
+    ) -> None:
+        self.__reset_cache_key_builder()
+        if cache_key_params is None:
+            self.__cache_key_params = None
+            return
+
+        key_params = (
+            frozenset(cache_key_params)
+            if not isinstance(cache_key_params, str)
+            else None
+        )
+        if key_params is None or not all(
+            isinstance(param, str) for param in key_params
+        ):
+            raise ValueError(
+                "Cache key params should be either None, or a collection of param names"
+            )
+        self.__cache_key_params = key_params
+
+    cache_key_params = property(get_cache_key_params, set_cache_key_params)
+
     # SEM VER
     def get_sem_ver(self) -> str:
         return self.__sem_ver
@@ -64,6 +140,7 @@ class Client:
             if semver_str_valid is None:
                 raise ValueError('Provided value of semver "%s" is not valid' % sem_ver)
         self.__sem_ver = sem_ver
+        self.__reset_cache_key_builder()
 
     sem_ver = property(get_sem_ver, set_sem_ver)
 
@@ -95,6 +172,118 @@ class Client:
         get_cache_expiration_seconds, set_cache_expiration_seconds
     )
 
+    # STALE WHILE REVALIDATE SECONDS
+    def get_stale_while_revalidate_seconds(self) -> int:
+        return self.__stale_while_revalidate_seconds
+
+    def set_stale_while_revalidate_seconds(
+        self, stale_while_revalidate_seconds: int
+    ) -> None:
+        if (
+            not isinstance(stale_while_revalidate_seconds, int)
+            or stale_while_revalidate_seconds < 0
+        ):
+            raise ValueError(
+                "Stale while revalidate seconds should be a valid non-negative integer"
+            )
+        self.__stale_while_revalidate_seconds = stale_while_revalidate_seconds
+
+    stale_while_revalidate_seconds = property(
+        get_stale_while_revalidate_seconds, set_stale_while_revalidate_seconds
+    )
+
+    # CACHE PER CONTENT ID
+    def get_cache_per_content_id(self) -> bool:
+        return self.__cache_per_content_id
+
+    def set_cache_per_content_id(self, cache_per_content_id: bool) -> None:
+        assert isinstance(cache_per_content_id, bool)
+        self.__cache_per_content_id = cache_per_content_id
+
+    cache_per_content_id = property(get_cache_per_content_id, set_cache_per_content_id)
+
+    # BATCH WINDOW SECONDS
+    def get_batch_window_seconds(self) -> float:
+        return self.__batch_window_seconds
+
+    def set_batch_window_seconds(self, batch_window_seconds: float) -> None:
+        if (
+            not isinstance(batch_window_seconds, (int, float))
+            or isinstance(batch_window_seconds, bool)
+            or batch_window_seconds < 0
+        ):
+            raise ValueError("Batch window seconds should be a non-negative number")
+        self.__batch_window_seconds = batch_window_seconds
+
+    batch_window_seconds = property(get_batch_window_seconds, set_batch_window_seconds)
+
+    # BATCH MAX SIZE
+    def get_batch_max_size(self) -> int:
+        return self.__batch_max_size
+
+    def set_batch_max_size(self, batch_max_size: int) -> None:
+        if (
+            not isinstance(batch_max_size, int)
+            or isinstance(batch_max_size, bool)
+            or batch_max_size < 1
+        ):
+            raise ValueError("Batch max size should be a positive integer")
+        self.__batch_max_size = batch_max_size
+
+    batch_max_size = property(get_batch_max_size, set_batch_max_size)
+
+    # FALLBACK TO LAST KNOWN GOOD
+    def get_fallback_to_last_known_good(self) -> bool:
+        return self.__fallback_to_last_known_good
+
+    def set_fallback_to_last_known_good(
+        self, fallback_to_last_known_good: bool
+    ) -> None:
+        assert isinstance(fallback_to_last_known_good, bool)
+        self.__fallback_to_last_known_good = fallback_to_last_known_good
+
+    fallback_to_last_known_good = property(
+        get_fallback_to_last_known_good, set_fallback_to_last_known_good
+    )
+
+    # IMMUTABLE RESULTS
+    def get_immutable_results(self) -> bool:
+        return self.__immutable_results
+
+    def set_immutable_results(self, immutable_results: bool) -> None:
+        assert isinstance(immutable_results, bool)
+        self.__immutable_results = immutable_results
+
+    immutable_results = property(get_immutable_results, set_immutable_results)
+
+    # CONDITIONAL REQUESTS
+    def get_conditional_requests(self) -> bool:
+        return self.__conditional_requests
+
+    def set_conditional_requests(self, conditional_requests: bool) -> None:
+        assert isinstance(conditional_requests, bool)
+        self.__conditional_requests = conditional_requests
+
+    conditional_requests = property(get_conditional_requests, set_conditional_requests)
+
+    # LOCAL EVALUATOR
+    def get_local_evaluator(self) -> t.Optional[LocalEvaluatorInterface]:
+        return self.__local_evaluator
+
+    def set_local_evaluator(
+        self, local_evaluator: t.Optional[LocalEvaluatorInterface]
+    ) -> None:
+        if local_evaluator is not None and not isinstance(
+            local_evaluator, LocalEvaluatorInterface
+        ):
+            raise ValueError(
+                "Local evaluator should be either None, or implement LocalEvaluatorInterface"
+            )
+        self.__local_evaluator = local_evaluator
+        self.__reset_cache_key_builder()
+
+    local_evaluator = property(get_local_evaluator, set_local_evaluator)
+
     # CACHE
     def get_cache(self) -> SyncCacheInterface:
         return self.__cache
@@ -113,15 +302,117 @@ class Client:
         serialized: bool = False,
         cache: t.Optional[SyncCacheInterface] = None,
         cache_expiration_seconds: int = 300,
+        stale_while_revalidate_seconds: int = 0,
+        cache_per_content_id: bool = False,
+        batch_window_seconds: float = 0,
+        batch_max_size: int = 100,
+        fallback_to_last_known_good: bool = False,
+        immutable_results: bool = False,
+        conditional_requests: bool = False,
+        local_evaluator: t.Optional[LocalEvaluatorInterface] = None,
+        cache_key_params: t.Optional[t.Iterable[str]] = None,
+        http_client: t.Optional[httpx.Client] = None,
+        http2: bool = False,
+        limits: t.Optional[httpx.Limits] = None,
+        timeout: t.Optional[httpx.Timeout] = None,
+        retry_policy: t.Optional[RetryPolicy] = None,
+        circuit_breaker: t.Optional[CircuitBreaker] = None,
+        json_codec: t.Optional[JsonCodecInterface] = None,
+        transport: t.Optional[SyncTransport] = None,
     ) -> None:
         self.api_key = api_key
         self.user_id = user_id
         self.params = ParamsDict() if params is None else params
+        self.cache_key_params = cache_key_params
         self.sem_ver = sem_ver
         self.serialized = serialized
         self.cache_expiration_seconds = cache_expiration_seconds
+        self.stale_while_revalidate_seconds = stale_while_revalidate_seconds
+        self.cache_per_content_id = cache_per_content_id
+        self.batch_window_seconds = batch_window_seconds
+        self.batch_max_size = batch_max_size
+        self.fallback_to_last_known_good = fallback_to_last_known_good
+        self.immutable_results = immutable_results
+        self.conditional_requests = conditional_requests
+        self.local_evaluator = local_evaluator
         self.cache = InMemoryCache() if cache is None else cache
-        self.__transport = SyncTransport(api_key=self.api_key)
+        if transport is not None:
+            if (
+                http_client is not None
+                or http2
+                or limits is not None
+                or timeout is not None
+                or retry_policy is not None
+                or circuit_breaker is not None
+                or json_codec is not None
+            ):
+                raise ValueError(
+                    "HTTP client, HTTP/2, limits, timeout, retry policy, circuit breaker and JSON "
+                    "codec should be configured on the provided transport"
+                )
+            self.__transport = transport
+            self.__owns_transport = False
+        else:
+            self.__transport = SyncTransport(
+                http_client=http_client,
+                http2=http2,
+                limits=limits,
+                timeout=timeout,
+                retry_policy=retry_policy,
+                circuit_breaker=circuit_breaker,
+                json_codec=json_codec,
+            )
+            self.__owns_transport = True
+        self.__owns_resources = True
+        self.__single_flight = SyncSingleFlight()
+        self.__background_tasks = SyncBackgroundTasks()
+        self.__warm_contents: t.List[t.Tuple[t.Set[str], t.Optional[bool], bool]] = []
+        self.__background_refresh: t.Optional[SyncPeriodicTask] = None
+        self.__background_refresh_lock = SyncCriticalSection()
+        self.__batcher = SyncBatcher(self.__get_batched_contents)
+        # Results are kept here after their expiration, to be served while Joystick API is unavailable
+        self.__last_known_good = LruStore(1000)
+        # The validators of the last responses, by request, for the conditional requests
+        self.__content_validators = LruStore(1000)
+        # The contents for the local evaluation don't depend on the user and params
+        self.__no_params = ParamsDict()
+
+    def with_context(
+        self,
+        user_id: t.Optional[str] = None,
+        params: t.Optional[t.Dict[str, t.Any]] = None,
+        sem_ver: t.Optional[str] = None,
+    ) -> "Client":
+        # Lightweight client for another user/params, which shares the transport (with its
+        # connection pool) and the cache with this client
+        context = Client(
+            api_key=self.api_key,
+            user_id=user_id if user_id is not None else self.user_id,
+            params=params if params is not None else ParamsDict(self.params),
+            cache_key_params=self.cache_key_params,
+            sem_ver=sem_ver if sem_ver is not None else self.sem_ver,
+            serialized=self.serialized,
+            cache=self.cache,
+            cache_expiration_seconds=self.cache_expiration_seconds,
+            stale_while_revalidate_seconds=self.stale_while_revalidate_seconds,
+            cache_per_content_id=self.cache_per_content_id,
+            batch_window_seconds=self.batch_window_seconds,
+            batch_max_size=self.batch_max_size,
+            fallback_to_last_known_good=self.fallback_to_last_known_good,
+            immutable_results=self.immutable_results,
+            conditional_requests=self.conditional_requests,
+            local_evaluator=self.local_evaluator,
+            transport=self.__transport,
+        )
+        # Cache keys include the user and params, so the in-flight requests can be shared too
+        context.__single_flight = self.__single_flight
+        context.__background_tasks = self.__background_tasks
+        context.__last_known_good = self.__last_known_good
+        context.__content_validators = self.__content_validators
+        # The shared resources are closed by this client
+        context.__owns_resources = False
+
+        return context
 
     def get_contents(
         self,
@@ -130,6 +421,100 @@ class Client:
         refresh: bool = False,
         full_response: bool = False,
     ) -> t.Dict[str, t.Any]:
+        self.__validate_contents_options(content_ids, serialized, full_response)
+        assert isinstance(
+            refresh, bool
+        ), "Refresh option should be boolean (default – False)"
+
+        serialized_normalized = (
+            serialized if serialized is not None else self.serialized
+        )
+
+        result = self.__get_contents(
+            content_ids_sorted=sorted(list(content_ids)),
+            serialized=serialized_normalized,
+            refresh=refresh,
+            full_response=full_response,
+        )
+
+        if self.__local_evaluator is not None:
+            return self.__evaluate_locally(self.__local_evaluator, result)
+        return result
+
+    def get_contents_for_users(
+        self,
+        content_ids: t.Set[str],
+        users: t.Iterable[t.Tuple[str, t.Optional[t.Dict[str, t.Any]]]],
+        concurrency: int = 10,
+        serialized: t.Optional[bool] = None,
+        full_response: bool = False,
+        return_exceptions: bool = False,
+    ) -> t.Iterator[UserContents]:
+        self.__validate_contents_options(content_ids, serialized, full_response)
+        if (
+            not isinstance(concurrency, int)
+            or isinstance(concurrency, bool)
+            or concurrency < 1
+        ):
+            raise ValueError("Concurrency should be a positive integer")
+        assert isinstance(return_exceptions, bool)
+
+        return self.__get_contents_for_users(
+            content_ids,
+            users,
+            concurrency,
+            serialized,
+            full_response,
+            return_exceptions,
+        )
+
+    def __get_contents_for_users(
+        self,
+        content_ids: t.Set[str],
+        users: t.Iterable[t.Tuple[str, t.Optional[t.Dict[str, t.Any]]]],
+        concurrency: int,
+        serialized: t.Optional[bool],
+        full_response: bool,
+        return_exceptions: bool,
+    ) -> t.Iterator[UserContents]:
+        def get_contents_for_user(
+            user: t.Tuple[str, t.Optional[t.Dict[str, t.Any]]],
+        ) -> t.Dict[str, t.Any]:
+            user_id, params = user
+            # The contexts share the cache and the in-flight requests, so the users with the same
+            # context (or the same cache key) share a single request to Joystick API
+            return self.with_context(user_id=user_id, params=params).get_contents(
+                content_ids, serialized=serialized, full_response=full_response
+            )
+
+        for user, contents, error in sync_map_bounded(
+            get_contents_for_user, users, concurrency
+        ):
+            if error is not None and not return_exceptions:
+                raise error
+            yield UserContents(
+                user_id=user[0], params=user[1], contents=contents, error=error
+            )
+
+    def prepare(
+        self,
+        content_ids: t.Set[str],
+        serialized: t.Optional[bool] = None,
+        full_response: bool = False,
+    ) -> SyncContentHandle:
+        self.__validate_contents_options(content_ids, serialized, full_response)
+
+        return SyncContentHandle(
+            content_ids_sorted=sorted(list(content_ids)),
+            serialized=serialized,
+            full_response=full_response,
+            get_contents=self.__get_prepared_contents,
+        )
+
+    @staticmethod
+    def __validate_contents_options(
+        content_ids: t.Set[str], serialized: t.Optional[bool], full_response: bool
+    ) -> None:
         assert isinstance(
             content_ids, set
         ), "Content IDs should be a set to enforce unique content ids"
@@ -141,72 +526,415 @@ class Client:
         assert isinstance(serialized, bool) or (
             serialized is None
         ), "Serialized option should be either boolean, or None (default - value from instance property `serialized`)"
+        assert isinstance(full_response, bool)
+
+    def __get_prepared_contents(
+        self, handle: SyncContentHandle, refresh: bool
+    ) -> t.Dict[str, t.Any]:
         assert isinstance(
             refresh, bool
         ), "Refresh option should be boolean (default – False)"
-        assert isinstance(full_response, bool)
 
-        serialized_normalized = (
-            serialized if serialized is not None else self.serialized
+        serialized = (
+            handle.serialized if handle.serialized is not None else self.__serialized
         )
 
-        content_ids_sorted = sorted(list(content_ids))
+        cache_key = None
+        if not self.__cache_per_content_id:
+            cache_key = handle.get_cache_key(self.__get_cache_key_builder(), serialized)
 
-        cache_key = build_cache_key(
-            api_key=self.api_key,
-            sem_ver=self.sem_ver,
-            user_id=self.user_id,
-            params=self.params,
-            additional_segments=[
-                content_ids_sorted,
-                serialized_normalized,
-                full_response,
-            ],
+        result = self.__get_contents(
+            content_ids_sorted=handle.content_ids_sorted,
+            serialized=serialized,
+            refresh=refresh,
+            full_response=handle.full_response,
+            cache_key=cache_key,
         )
 
+        if self.__local_evaluator is not None:
+            return self.__evaluate_locally(self.__local_evaluator, result)
+        return result
+
+    def __evaluate_locally(
+        self, local_evaluator: LocalEvaluatorInterface, result: t.Dict[str, t.Any]
+    ) -> t.Dict[str, t.Any]:
+        evaluated_result = dict(
+            (
+                content_id,
+                local_evaluator.evaluate(
+                    content_id, content, self.__user_id, self.__params, self.__sem_ver
+                ),
+            )
+            for content_id, content in result.items()
+        )
+        return self.__freeze_result(evaluated_result)
+
+    def __get_contents(
+        self,
+        content_ids_sorted: t.List[str],
+        serialized: bool,
+        refresh: bool,
+        full_response: bool,
+        cache_key: t.Optional[str] = None,
+    ) -> t.Dict[str, t.Any]:
+        if self.cache_per_content_id:
+            return self.__get_contents_per_content_id(
+                content_ids_sorted=content_ids_sorted,
+                serialized=serialized,
+                refresh=refresh,
+                full_response=full_response,
+            )
+
+        if cache_key is None:
+            cache_key = self.__build_cache_key(
+                content_ids_sorted, serialized, full_response
+            )
+
+        cached_result: t.Optional[t.Dict[str, t.Any]] = None
         if not refresh:
-            cached_result = self.cache.get(cache_key)
-            if cached_result is not None:
-                assert isinstance(cached_result, dict)
+            cached_result, is_fresh = self.__get_cached(cache_key)
+            if cached_result is not None and is_fresh:
                 return cached_result
 
-        query_params = {
-            "c": json.dumps(content_ids_sorted),
-            "dynamic": "true",
-            **({"responseType": "serialized"} if serialized_normalized else {}),
-        }
+        fetch = functools.partial(
+            self.__fetch_contents,
+            content_ids_sorted=content_ids_sorted,
+            serialized=serialized,
+            full_response=full_response,
+            request_body=self.__build_request_body(),
+            request_key=cache_key,
+            cache_key=cache_key,
+        )
+
+        if cached_result is not None:
+            self.__revalidate_in_background(cache_key, fetch)
+            return cached_result
+
+        return self.__fetch_or_fall_back(cache_key, fetch)
+
+    def __get_contents_per_content_id(
+        self,
+        content_ids_sorted: t.List[str],
+        serialized: bool,
+        refresh: bool,
+        full_response: bool,
+    ) -> t.Dict[str, t.Any]:
+        content_cache_keys = dict(
+            (
+                content_id,
+                self.__build_cache_key(content_id, serialized, full_response),
+            )
+            for content_id in content_ids_sorted
+        )
+
+        result: t.Dict[str, t.Any] = {}
+        missing_content_ids = []
+        stale_content_ids = []
+
+        for content_id, content_cache_key in content_cache_keys.items():
+            cached_result, is_fresh = (
+                (None, False) if refresh else self.__get_cached(content_cache_key)
+            )
+            if cached_result is None or content_id not in cached_result:
+                missing_content_ids.append(content_id)
+                continue
+
+            result[content_id] = cached_result[content_id]
+            if not is_fresh:
+                stale_content_ids.append(content_id)
+
+        if len(stale_content_ids) != 0:
+            request_key = self.__build_cache_key(
+                stale_content_ids, serialized, full_response
+            )
+            self.__revalidate_in_background(
+                request_key,
+                functools.partial(
+                    self.__fetch_contents,
+                    content_ids_sorted=stale_content_ids,
+                    serialized=serialized,
+                    full_response=full_response,
+                    request_body=self.__build_request_body(),
+                    request_key=request_key,
+                    content_cache_keys=content_cache_keys,
+                ),
+            )
+
+        if len(missing_content_ids) != 0:
+            # Only the contents which are not cached are requested from Joystick API
+            request_key = self.__build_cache_key(
+                missing_content_ids, serialized, full_response
+            )
+            fetched_result = self.__fetch_or_fall_back(
+                request_key,
+                functools.partial(
+                    self.__fetch_contents,
+                    content_ids_sorted=missing_content_ids,
+                    serialized=serialized,
+                    full_response=full_response,
+                    request_body=self.__build_request_body(),
+                    request_key=request_key,
+                    content_cache_keys=content_cache_keys,
+                ),
+                content_cache_keys=dict(
+                    (content_id, content_cache_keys[content_id])
+                    for content_id in missing_content_ids
+                ),
+            )
+            result.update(fetched_result)
+
+        return self.__freeze_result(result)
+
+    def __fetch_or_fall_back(
+        self,
+        cache_key: str,
+        fetch: t.Callable[[], t.Any],
+        content_cache_keys: t.Optional[t.Dict[str, str]] = None,
+    ) -> t.Dict[str, t.Any]:
+        try:
+            # Concurrent cache misses for the same key share a single request to Joystick API
+            return t.cast(t.Dict[str, t.Any], self.__single_flight.do(cache_key, fetch))
+        except Exception as e:
+            # Don't keep the other callers waiting for the entry which is not going to be cached
+            for key in (
+                content_cache_keys.values()
+                if content_cache_keys is not None
+                else (cache_key,)
+            ):
+                self.cache.release(key)
+
+            if (
+                not isinstance(e, FALLBACK_ERRORS)
+                or not self.fallback_to_last_known_good
+            ):
+                raise
+
+            fallback_result = self.__get_last_known_good(cache_key, content_cache_keys)
+            if fallback_result is None:
+                raise
+            return fallback_result
+
+    def __get_last_known_good(
+        self, cache_key: str, content_cache_keys: t.Optional[t.Dict[str, str]]
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        if content_cache_keys is None:
+            return self.__get_last_known_good_entry(cache_key)
+
+        result = {}
+        for content_id, content_cache_key in content_cache_keys.items():
+            last_known_good = self.__get_last_known_good_entry(content_cache_key)
+            if last_known_good is None or content_id not in last_known_good:
+                return None
+            result[content_id] = last_known_good[content_id]
+        return result
+
+    def __get_last_known_good_entry(
+        self, cache_key: str
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        last_known_good = self.__last_known_good.get(cache_key)
+        if last_known_good is not None:
+            return t.cast(t.Dict[str, t.Any], last_known_good)
+
+        # Not fetched since the start, e.g. the expired entry of the snapshot persisted by the cache
+        expired_result, _ = unwrap_cache_entry(self.cache.get_expired(cache_key))
+        if expired_result is None:
+            return None
+
+        assert isinstance(expired_result, dict)
+        return self.__freeze_result(expired_result)
+
+    def __build_cache_key(
+        self,
+        content_ids: t.Union[str, t.List[str]],
+        serialized: bool,
+        full_response: bool,
+    ) -> str:
+        return self.__get_cache_key_builder().build(
+            [content_ids, serialized, full_response]
+        )
+
+    def __reset_cache_key_builder(self) -> None:
+        self.__cache_key_builder: t.Optional[CacheKeyBuilder] = None
+
+    def __get_cache_key_builder(self) -> CacheKeyBuilder:
+        # The contents for the local evaluation are the same for all the users. The user ID is
+        # `None` for them, which never matches the user ID of the dynamic contents
+        user_id: t.Optional[str] = self.__user_id
+        params = self.__params
+        if self.__local_evaluator is not None:
+            user_id = None
+            params = self.__no_params
+
+        # The builder is reset by the setters of the client context properties
+        builder = self.__cache_key_builder
+        if builder is None or builder.params_version != params.version:
+            builder = CacheKeyBuilder(
+                api_key=self.__api_key,
+                sem_ver=self.__sem_ver,
+                user_id=user_id,
+                params=params,
+                key_params=self.__cache_key_params,
+            )
+            self.__cache_key_builder = builder
+
+        return builder
 
-        request_body = {
+    def __build_request_body(self) -> t.Dict[str, t.Any]:
+        if self.__local_evaluator is not None:
+            return {
+                "u": "",
+                "p": ParamsDict(),
+                **({"v": self.sem_ver} if self.sem_ver != "" else {}),
+            }
+
+        return {
             "u": self.user_id,
-            "p": self.params,
+            "p": ParamsDict(self.params),
             **({"v": self.sem_ver} if self.sem_ver != "" else {}),
         }
 
-        query_params_encoded = urllib.parse.urlencode(query_params)
+    def __get_cached(
+        self, cache_key: str
+    ) -> t.Tuple[t.Optional[t.Dict[str, t.Any]], bool]:
+        cached_result, fresh_until = unwrap_cache_entry(self.cache.get(cache_key))
+        if cached_result is None:
+            return None, False
+
+        assert isinstance(cached_result, dict)
+        return (
+            self.__freeze_result(cached_result),
+            fresh_until is None or time() <= fresh_until,
+        )
+
+    def __freeze_result(self, result: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        # The results are shared through the cache, so they're frozen instead of being copied.
+        # Frozen results (e.g. from the in-memory cache) are returned as is
+        if self.__immutable_results:
+            return t.cast(t.Dict[str, t.Any], freeze(result))
+        return result
+
+    def __revalidate_in_background(
+        self, cache_key: str, fetch: t.Callable[[], t.Any]
+    ) -> None:
+        # The result is stale: it's served immediately and refreshed in background
+        if not self.__single_flight.in_flight(cache_key):
+            self.__background_tasks.spawn(
+                lambda: self.__single_flight.do(cache_key, fetch)
+            )
+
+    def __fetch_contents(
+        self,
+        content_ids_sorted: t.List[str],
+        serialized: bool,
+        full_response: bool,
+        request_body: t.Dict[str, t.Any],
+        request_key: str,
+        cache_key: t.Optional[str] = None,
+        content_cache_keys: t.Optional[t.Dict[str, str]] = None,
+    ) -> t.Dict[str, t.Any]:
+        query_params = {
+            "c": json.dumps(content_ids_sorted),
+            # The dynamic contents are resolved by Joystick API for the user, otherwise locally
+            **({"dynamic": "true"} if self.__local_evaluator is None else {}),
+            **({"responseType": "serialized"} if serialized else {}),
+        }
+
+        url = "https://api.getjoystick.com/api/v1/combine/?" + urllib.parse.urlencode(
+            query_params
+        )
+
+        if self.conditional_requests:
+            processed_response = self.__fetch_contents_conditionally(
+                url, request_body, request_key, full_response
+            )
+        else:
+            response = self.__transport.make_request(
+                "POST", url, request_body, api_key=self.api_key
+            )
+            processed_response = self.__process_response(response, full_response)
+
+        if cache_key is not None:
+            self.__set_cached(cache_key, processed_response)
+
+        if content_cache_keys is not None:
+            for content_id, content in processed_response.items():
+                if content_id in content_cache_keys:
+                    self.__set_cached(
+                        content_cache_keys[content_id],
+                        self.__freeze_result({content_id: content}),
+                    )
+
+        return processed_response
+
+    def __fetch_contents_conditionally(
+        self,
+        url: str,
+        request_body: t.Dict[str, t.Any],
+        request_key: str,
+        full_response: bool,
+    ) -> t.Dict[str, t.Any]:
+        validator: t.Optional[ContentValidator] = self.__content_validators.get(
+            request_key
+        )
 
-        response = self.__transport.make_request(
+        response = self.__transport.make_conditional_request(
             "POST",
-            "https://api.getjoystick.com/api/v1/combine/?" + query_params_encoded,
+            url,
             request_body,
+            api_key=self.api_key,
+            etag=validator.etag if validator is not None else None,
+            content_hash=validator.content_hash if validator is not None else None,
+        )
+
+        if response.not_modified and validator is not None:
+            # Nothing to decode and process, the previous result is stored again to extend its TTL
+            result = validator.result
+        else:
+            result = self.__process_response(response.data, full_response)
+
+        self.__content_validators.set(
+            request_key,
+            ContentValidator(
+                etag=response.etag, content_hash=response.content_hash, result=result
+            ),
         )
+        return result
 
+    def __process_response(
+        self, response: t.Any, full_response: bool
+    ) -> t.Dict[str, t.Any]:
         assert isinstance(response, dict)
 
         self.validate_get_contents_response(response)
 
-        processed_response = response
         if not full_response:
-            processed_response = dict(
-                (key, content["data"]) for (key, content) in response.items()
-            )
+            # The values are replaced in place, instead of building another dictionary
+            for key, content in response.items():
+                response[key] = content["data"]
+        return self.__freeze_result(response)
 
-        self.cache.set(
-            key=cache_key,
-            value=processed_response,
-            cache_expiration_seconds=self.cache_expiration_seconds,
-        )
+    def __set_cached(self, cache_key: str, value: t.Dict[str, t.Any]) -> None:
+        if self.fallback_to_last_known_good:
+            self.__last_known_good.set(cache_key, value)
 
-        return processed_response
+        if self.stale_while_revalidate_seconds > 0:
+            # Keep the entry in the cache for longer than it's fresh, so it can be served while
+            # being revalidated
+            self.cache.set(
+                key=cache_key,
+                value=wrap_cache_entry(
+                    value=value,
+                    fresh_until=time() + self.cache_expiration_seconds,
+                ),
+                cache_expiration_seconds=self.cache_expiration_seconds
+                + self.stale_while_revalidate_seconds,
+            )
+        else:
+            self.cache.set(
+                key=cache_key,
+                value=value,
+                cache_expiration_seconds=self.cache_expiration_seconds,
+            )
 
     def get_content(
         self,
@@ -215,12 +943,20 @@ class Client:
         refresh: bool = False,
         full_response: bool = False,
     ) -> t.Any:
-        contents = self.get_contents(
-            {content_id},
-            serialized=serialized,
-            refresh=refresh,
-            full_response=full_response,
-        )
+        if self.batch_window_seconds > 0:
+            contents = self.__get_content_batched(
+                content_id,
+                serialized=serialized,
+                refresh=refresh,
+                full_response=full_response,
+            )
+        else:
+            contents = self.get_contents(
+                {content_id},
+                serialized=serialized,
+                refresh=refresh,
+                full_response=full_response,
+            )
 
         if contents.get(content_id, None) is None:
             raise MultipleContentsApiError(
@@ -229,6 +965,48 @@ class Client:
 
         return contents.get(content_id)
 
+    def __get_content_batched(
+        self,
+        content_id: str,
+        serialized: t.Optional[bool],
+        refresh: bool,
+        full_response: bool,
+    ) -> t.Dict[str, t.Any]:
+        serialized_normalized = (
+            serialized if serialized is not None else self.serialized
+        )
+
+        try:
+            # Concurrent calls with the same options during the batch window are merged into one
+            # request to Joystick API
+            return self.__batcher.submit(
+                (serialized_normalized, refresh, full_response),
+                content_id,
+                window_seconds=self.batch_window_seconds,
+                max_size=self.batch_max_size,
+            )
+        except MultipleContentsApiError:
+            # One of the batched contents is failed, request this content alone to get either the
+            # content or its own error
+            return self.get_contents(
+                {content_id},
+                serialized=serialized_normalized,
+                refresh=refresh,
+                full_response=full_response,
+            )
+
+    def __get_batched_contents(
+        self, key: t.Hashable, content_ids: t.Set[str]
+    ) -> t.Dict[str, t.Any]:
+        serialized, refresh, full_response = t.cast(t.Tuple[bool, bool, bool], key)
+
+        return self.get_contents(
+            content_ids,
+            serialized=serialized,
+            refresh=refresh,
+            full_response=full_response,
+        )
+
     def publish_content_update(
         self,
         content_id: str,
@@ -247,7 +1025,10 @@ class Client:
         body = {"d": description, "c": content, "m": dynamic_content_map}
 
         self.__transport.make_request(
-            "PUT", f"https://capi.getjoystick.com/api/v1/config/{content_id}", body
+            "PUT",
+            f"https://capi.getjoystick.com/api/v1/config/{content_id}",
+            body,
+            api_key=self.api_key,
         )
 
     def validate_get_contents_response(
@@ -256,7 +1037,7 @@ class Client:
         string_contents = [
             "Content ID: %s, error: %s" % (key, content)
             for (key, content) in get_contents_response.items()
-            if type(content) == str
+            if type(content) is str
         ]
 
         if len(string_contents) != 0:
@@ -267,3 +1048,91 @@ class Client:
 
     def clear_cache(self) -> None:
         self.__cache.clear()
+
+    # BACKGROUND REFRESH
+    def add_warm_contents(
+        self,
+        content_ids: t.Set[str],
+        serialized: t.Optional[bool] = None,
+        full_response: bool = False,
+    ) -> None:
+        assert isinstance(
+            content_ids, set
+        ), "Content IDs should be a set to enforce unique content ids"
+        assert len(content_ids) > 0, "Set of content IDs should be non-empty"
+
+        self.__warm_contents.append((set(content_ids), serialized, full_response))
+
+    def start_background_refresh(
+        self,
+        refresh_interval_seconds: t.Optional[float] = None,
+        jitter_seconds: float = 0,
+    ) -> None:
+        # By default, refresh the contents ahead of their expiration
+        interval = (
+            refresh_interval_seconds
+            if refresh_interval_seconds is not None
+            else self.cache_expiration_seconds * 0.8
+        )
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError("Refresh interval seconds should be a positive number")
+        if not isinstance(jitter_seconds, (int, float)) or not (
+            0 <= jitter_seconds < interval
+        ):
+            raise ValueError(
+                "Jitter seconds should be a non-negative number lower than the refresh interval"
+            )
+
+        with self.__background_refresh_lock:
+            if self.__background_refresh is None:
+                self.__background_refresh = SyncPeriodicTask(
+                    self.__refresh_warm_contents,
+                    lambda: interval - random.uniform(0, jitter_seconds),
+                )
+                self.__background_refresh.start()
+
+        # Preload the contents. The refresh keeps running even if the preload failed
+        self.__refresh_warm_contents()
+
+    def stop_background_refresh(self) -> None:
+        with self.__background_refresh_lock:
+            background_refresh = self.__background_refresh
+            self.__background_refresh = None
+        if background_refresh is not None:
+            background_refresh.stop()
+
+    def __refresh_warm_contents(self) -> None:
+        errors = []
+        for content_ids, serialized, full_response in list(self.__warm_contents):
+            try:
+                self.get_contents(
+                    content_ids,
+                    serialized=serialized,
+                    refresh=True,
+                    full_response=full_response,
+                )
+            except SyncCancelledError:
+                raise
+            except Exception as e:
+                errors.append(e)
+
+        if len(errors) != 0:
+            raise errors[0]
+
+    # LIFECYCLE
+    def close(self) -> None:
+        self.stop_background_refresh()
+
+        if self.__owns_resources:
+            self.__background_tasks.close()
+            self.__single_flight.close()
+            self.cache.close()
+            if self.__owns_transport:
+                self.__transport.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.close()
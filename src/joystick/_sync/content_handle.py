@@ -0,0 +1,56 @@
+import typing as t
+
+from .cache_key_builder import CacheKeyBuilder
+
+
+class SyncContentHandle:
+    # Returned by `AsyncClient.prepare`: the content IDs and the options are validated once, and the
+    # cache key is reused until the client context changes
+    def __init__(
+        self,
+        *,
+        content_ids_sorted: t.List[str],
+        serialized: t.Optional[bool],
+        full_response: bool,
+        get_contents: t.Callable[["SyncContentHandle", bool], t.Any],
+    ) -> None:
+        self.__content_ids_sorted = content_ids_sorted
+        self.__serialized = serialized
+        self.__full_response = full_response
+        self.__get_contents = get_contents
+        # (builder, serialized, cache key), replaced as a whole so it's never partially updated
+        self.__cache_key: t.Optional[t.Tuple[CacheKeyBuilder, bool, str]] = None
+
+    @property
+    def content_ids(self) -> t.List[str]:
+        return list(self.__content_ids_sorted)
+
+    @property
+    def content_ids_sorted(self) -> t.List[str]:
+        return self.__content_ids_sorted
+
+    @property
+    def serialized(self) -> t.Optional[bool]:
+        return self.__serialized
+
+    @property
+    def full_response(self) -> bool:
+        return self.__full_response
+
+    def get_cache_key(self, builder: CacheKeyBuilder, serialized: bool) -> str:
+        cache_key = self.__cache_key
+        if (
+            cache_key is not None
+            and cache_key[0] is builder
+            and cache_key[1] == serialized
+        ):
+            return cache_key[2]
+
+        key = builder.build(
+            [self.__content_ids_sorted, serialized, self.__full_response]
+        )
+        self.__cache_key = (builder, serialized, key)
+        return key
+
+    def get_contents(self, refresh: bool = False) -> t.Dict[str, t.Any]:
+        return t.cast(t.Dict[str, t.Any], self.__get_contents(self, refresh))
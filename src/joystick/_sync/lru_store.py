@@ -0,0 +1,27 @@
+import typing as t
+
+import pylru  # type: ignore
+
+from joystick._concurrency import SyncCriticalSection
+
+
+class LruStore:
+    # `pylru` allocates all the entries upfront, so the cache is created on the first write, and
+    # the stores which stay empty (e.g. of the clients created by `with_context`) cost nothing.
+    # `pylru` caches reorder their entries even on reads, so every access takes the lock
+    def __init__(self, size: int) -> None:
+        self.__size = size
+        self.__cache: t.Optional[t.Any] = None
+        self.__lock = SyncCriticalSection()
+
+    def get(self, key: str) -> t.Optional[t.Any]:
+        with self.__lock:
+            if self.__cache is None:
+                return None
+            return self.__cache.get(key)
+
+    def set(self, key: str, value: t.Any) -> None:
+        with self.__lock:
+            if self.__cache is None:
+                self.__cache = pylru.lrucache(self.__size)
+            self.__cache[key] = value
@@ -3,6 +3,8 @@ import typing as t
 
 class ParamsDict(t.Dict[str, t.Any]):
     def __init__(self, *args: t.Dict[str, t.Any], **kwargs: t.Any) -> None:
+        # Incremented on every change, so the values computed from params can be reused until then
+        self.__version = 0
         if args:
             if len(args) > 1:
                 raise TypeError(
@@ -14,5 +16,38 @@ class ParamsDict(t.Dict[str, t.Any]):
         for key in kwargs:
             self[key] = kwargs[key]
 
+    @property
+    def version(self) -> int:
+        return self.__version
+
     def __setitem__(self, key: str, value: t.Any) -> None:
         super(ParamsDict, self).__setitem__(key, value)
+        self.__version += 1
+
+    def __delitem__(self, key: str) -> None:
+        super(ParamsDict, self).__delitem__(key)
+        self.__version += 1
+
+    def update(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super(ParamsDict, self).update(*args, **kwargs)
+        self.__version += 1
+
+    def setdefault(self, key: str, default: t.Any = None) -> t.Any:
+        self.__version += 1
+        return super(ParamsDict, self).setdefault(key, default)
+
+    def pop(self, key: str, *args: t.Any) -> t.Any:
+        self.__version += 1
+        return super(ParamsDict, self).pop(key, *args)
+
+    def popitem(self) -> t.Tuple[str, t.Any]:
+        self.__version += 1
+        return super(ParamsDict, self).popitem()
+
+    def clear(self) -> None:
+        super(ParamsDict, self).clear()
+        self.__version += 1
+
+    def __ior__(self, other: t.Any) -> "ParamsDict":  # type: ignore[misc,override]
+        self.update(other)
+        return self
@@ -0,0 +1,61 @@
+import threading
+import typing as t
+from time import monotonic
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout_seconds: float = 30
+    ) -> None:
+        if not isinstance(failure_threshold, int) or failure_threshold < 1:
+            raise ValueError("Failure threshold should be a positive integer")
+        if recovery_timeout_seconds < 0:
+            raise ValueError("Recovery timeout seconds should be non-negative")
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_seconds = recovery_timeout_seconds
+        self.__lock = threading.Lock()
+        self.__state = self.CLOSED
+        self.__failures = 0
+        self.__opened_at: t.Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        return self.__state
+
+    def allow_request(self) -> bool:
+        with self.__lock:
+            if self.__state == self.CLOSED:
+                return True
+
+            assert self.__opened_at is not None
+            if monotonic() - self.__opened_at < self.recovery_timeout_seconds:
+                # Either the circuit is open, or the trial request is still in progress
+                return False
+
+            # Let a single trial request through to check whether the API has recovered. If the
+            # trial neither succeeds nor fails (e.g. it's cancelled), another one is let through
+            # after the recovery timeout
+            self.__state = self.HALF_OPEN
+            self.__opened_at = monotonic()
+            return True
+
+    def record_success(self) -> None:
+        with self.__lock:
+            self.__state = self.CLOSED
+            self.__failures = 0
+            self.__opened_at = None
+
+    def record_failure(self) -> None:
+        with self.__lock:
+            self.__failures += 1
+            if (
+                self.__state == self.HALF_OPEN
+                or self.__failures >= self.failure_threshold
+            ):
+                self.__state = self.OPEN
+                self.__opened_at = monotonic()
@@ -1,9 +1,11 @@
 from .api import BadRequestError
+from .api import CircuitOpenError
 from .api import ServerError
 from .api import UnknownError
 
 __all__ = [
     "BadRequestError",
+    "CircuitOpenError",
     "ServerError",
     "UnknownError",
 ]
@@ -17,6 +17,10 @@ class UnknownError(ApiHttpError):
     pass
 
 
+class CircuitOpenError(JoystickError):
+    pass
+
+
 class ApiError(JoystickError):
     pass
 
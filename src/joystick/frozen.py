@@ -0,0 +1,54 @@
+import typing as t
+
+
+class FrozenDict(t.Dict[str, t.Any]):
+    # Read-only dictionary for the results shared through the cache. It's still a `dict`, so it
+    # can be serialized by the caches (e.g. to JSON) like the plain results
+    def __readonly(self) -> t.NoReturn:
+        raise TypeError("Joystick results are read-only, copy them to make changes")
+
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        self.__readonly()
+
+    def __delitem__(self, key: str) -> None:
+        self.__readonly()
+
+    def update(self, *args: t.Any, **kwargs: t.Any) -> None:
+        self.__readonly()
+
+    def setdefault(self, key: str, default: t.Any = None) -> t.Any:
+        self.__readonly()
+
+    def pop(self, key: str, *args: t.Any) -> t.Any:
+        self.__readonly()
+
+    def popitem(self) -> t.Tuple[str, t.Any]:
+        self.__readonly()
+
+    def clear(self) -> None:
+        self.__readonly()
+
+    def __ior__(self, other: t.Any) -> "FrozenDict":  # type: ignore[misc,override]
+        self.__readonly()
+
+    # Nothing can change, so copies are not needed
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: t.Dict[int, t.Any]) -> "FrozenDict":
+        return self
+
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: t.Any) -> t.Any:
+    # Dictionaries become `FrozenDict` and lists become tuples, recursively. Already frozen values
+    # are returned as is, so the results assembled from frozen parts are cheap to freeze
+    if isinstance(value, (FrozenDict, tuple)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
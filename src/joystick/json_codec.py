@@ -0,0 +1,86 @@
+import json
+import typing as t
+from abc import ABC
+from abc import abstractmethod
+
+
+class JsonCodecInterface(ABC):
+    # Encodes the request bodies and the cache entries, and decodes the responses and the cache
+    # entries. Decoding errors should subclass `json.JSONDecodeError`, as the standard library ones
+    @abstractmethod
+    def dumps(self, value: t.Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, content: t.Union[bytes, str]) -> t.Any:
+        pass
+
+
+class StandardJsonCodec(JsonCodecInterface):
+    def dumps(self, value: t.Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    def loads(self, content: t.Union[bytes, str]) -> t.Any:
+        return json.loads(content)
+
+
+class OrjsonCodec(JsonCodecInterface):
+    def __init__(self) -> None:
+        import orjson
+
+        self.__orjson = orjson
+
+    def dumps(self, value: t.Any) -> bytes:
+        return self.__orjson.dumps(value)
+
+    def loads(self, content: t.Union[bytes, str]) -> t.Any:
+        # `orjson.JSONDecodeError` is a subclass of `json.JSONDecodeError`
+        return self.__orjson.loads(content)
+
+
+class MsgspecCodec(JsonCodecInterface):
+    def __init__(self) -> None:
+        import msgspec  # type: ignore[import-not-found,unused-ignore]
+
+        self.__msgspec = msgspec
+        self.__encoder = msgspec.json.Encoder()
+        self.__decoder = msgspec.json.Decoder()
+
+    def dumps(self, value: t.Any) -> bytes:
+        encoded: bytes = self.__encoder.encode(value)
+        return encoded
+
+    def loads(self, content: t.Union[bytes, str]) -> t.Any:
+        try:
+            return self.__decoder.decode(content)
+        except self.__msgspec.DecodeError as e:
+            raise json.JSONDecodeError(
+                str(e),
+                (
+                    content
+                    if isinstance(content, str)
+                    else content.decode("utf-8", "replace")
+                ),
+                0,
+            ) from e
+
+
+_default_json_codec: t.Optional[JsonCodecInterface] = None
+
+
+def get_default_json_codec() -> JsonCodecInterface:
+    # The fastest of the installed libraries: `orjson`, `msgspec`, or the standard library
+    global _default_json_codec
+    if _default_json_codec is None:
+        for codec_class in (OrjsonCodec, MsgspecCodec):
+            try:
+                _default_json_codec = codec_class()
+                break
+            except ImportError:
+                pass
+        else:
+            _default_json_codec = StandardJsonCodec()
+
+    return _default_json_codec
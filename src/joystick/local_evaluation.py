@@ -0,0 +1,19 @@
+import typing as t
+from abc import ABC
+from abc import abstractmethod
+
+
+class LocalEvaluatorInterface(ABC):
+    # Resolves the variant of the content for the user in-process. With a local evaluator, the
+    # client requests the contents without the user context (not dynamic), so every content is
+    # requested and cached once for all the users, and calls `evaluate` for every result
+    @abstractmethod
+    def evaluate(
+        self,
+        content_id: str,
+        content: t.Any,
+        user_id: str,
+        params: t.Mapping[str, t.Any],
+        sem_ver: str,
+    ) -> t.Any:
+        pass
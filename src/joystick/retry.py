@@ -0,0 +1,74 @@
+import random
+import threading
+import typing as t
+
+import httpx
+
+DEFAULT_RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_RETRYABLE_EXCEPTIONS: t.Tuple[t.Type[BaseException], ...] = (
+    httpx.TransportError,
+)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_seconds: float = 0.1,
+        max_backoff_seconds: float = 2.0,
+        retryable_status_codes: t.Iterable[int] = DEFAULT_RETRYABLE_STATUS_CODES,
+        retryable_exceptions: t.Tuple[
+            t.Type[BaseException], ...
+        ] = DEFAULT_RETRYABLE_EXCEPTIONS,
+        budget_ratio: float = 0.2,
+        budget_min_retries: int = 10,
+    ) -> None:
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValueError("Max attempts should be a positive integer")
+        if backoff_seconds < 0 or max_backoff_seconds < backoff_seconds:
+            raise ValueError(
+                "Backoff seconds should be non-negative and not greater than max backoff seconds"
+            )
+        if budget_ratio < 0 or budget_min_retries < 0:
+            raise ValueError("Retry budget should be non-negative")
+
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.retryable_status_codes = frozenset(retryable_status_codes)
+        self.retryable_exceptions = retryable_exceptions
+        self.budget_ratio = budget_ratio
+        self.budget_min_retries = budget_min_retries
+
+    def get_backoff_seconds(self, attempt: int) -> float:
+        # Exponential backoff with "full jitter", so the retries of many clients are spread in time
+        return random.uniform(
+            0, min(self.max_backoff_seconds, self.backoff_seconds * (2**attempt))
+        )
+
+    def is_retryable_status_code(self, status_code: int) -> bool:
+        return status_code in self.retryable_status_codes
+
+    def is_retryable_exception(self, exception: BaseException) -> bool:
+        return isinstance(exception, self.retryable_exceptions)
+
+
+class RetryBudget:
+    # Every request deposits `budget_ratio` of a retry, and every retry withdraws one. So during an
+    # outage the retries add at most `budget_ratio` to the load, after `budget_min_retries` are spent
+    def __init__(self, policy: RetryPolicy) -> None:
+        self.__ratio = policy.budget_ratio
+        self.__max_balance = max(float(policy.budget_min_retries), 1.0)
+        self.__balance = float(policy.budget_min_retries)
+        self.__lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self.__lock:
+            self.__balance = min(self.__max_balance, self.__balance + self.__ratio)
+
+    def try_withdraw(self) -> bool:
+        with self.__lock:
+            if self.__balance < 1:
+                return False
+            self.__balance -= 1
+            return True
@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+import pytest
+from unittest.mock import patch
+
+from joystick import SyncClockCache
+from joystick._async.cache.clock import ClockCache
+
+
+@pytest.mark.asyncio
+async def test_clock_cache_evicts_entries_which_were_not_referenced():
+    cache = ClockCache(max_entries=3)
+
+    await cache.set('first', 1, cache_expiration_seconds=60)
+    await cache.set('second', 2, cache_expiration_seconds=60)
+    await cache.set('third', 3, cache_expiration_seconds=60)
+    await cache.get('first')
+    await cache.get('third')
+    await cache.set('fourth', 4, cache_expiration_seconds=60)
+
+    assert await cache.get('first') == 1
+    assert await cache.get('second') is None
+    assert await cache.get('third') == 3
+    assert await cache.get('fourth') == 4
+    assert cache.get_stats().evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_clock_cache_evicts_when_all_entries_were_referenced():
+    cache = ClockCache(max_entries=2)
+
+    await cache.set('first', 1, cache_expiration_seconds=60)
+    await cache.set('second', 2, cache_expiration_seconds=60)
+    await cache.get('first')
+    await cache.get('second')
+    await cache.set('third', 3, cache_expiration_seconds=60)
+
+    stats = cache.get_stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+    assert await cache.get('third') == 3
+
+
+@pytest.mark.asyncio
+async def test_clock_cache_evicts_expired_entries_first():
+    cache = ClockCache(max_entries=2)
+
+    await cache.set('short', 1, cache_expiration_seconds=1)
+    await cache.set('long', 2, cache_expiration_seconds=60)
+    await cache.get('short')
+
+    with patch('joystick._async.cache.clock.time', return_value=time() + 30):
+        await cache.set('new', 3, cache_expiration_seconds=60)
+
+    assert await cache.get('long') == 2
+    assert await cache.get('new') == 3
+
+
+@pytest.mark.asyncio
+async def test_clock_cache_evicts_by_size():
+    cache = ClockCache(max_bytes=100)
+
+    await cache.set('small', {'key': 'value'}, cache_expiration_seconds=60)
+    await cache.set('large', {'key': 'v' * 80}, cache_expiration_seconds=60)
+    await cache.set('too large', 'v' * 200, cache_expiration_seconds=60)
+
+    assert await cache.get('small') is None
+    assert await cache.get('large') == {'key': 'v' * 80}
+    assert await cache.get('too large') is None
+    assert cache.get_stats().size_bytes == len('{"key":"' + 'v' * 80 + '"}')
+
+
+@pytest.mark.asyncio
+async def test_clock_cache_replaces_and_clears_entries():
+    cache = ClockCache(max_entries=2)
+
+    await cache.set('key', 1, cache_expiration_seconds=60)
+    await cache.set('key', 2, cache_expiration_seconds=60)
+    assert await cache.get('key') == 2
+    assert cache.get_stats().entries == 1
+
+    await cache.clear()
+    assert await cache.get('key') is None
+    assert cache.get_stats().entries == 0
+
+
+@pytest.mark.parametrize("options", [{'max_entries': 0}, {'max_entries': 1.5}, {'max_bytes': 0}, {'max_bytes': '1'}])
+def test_clock_cache_wrong_options(options):
+    with pytest.raises(ValueError):
+        ClockCache(**options)
+
+
+def test_sync_clock_cache_is_thread_safe():
+    cache = SyncClockCache(max_entries=256)
+
+    def work(thread):
+        for i in range(2000):
+            key = f'key{(thread * 7 + i) % 512}'
+            cache.set(key, i, cache_expiration_seconds=60)
+            cache.get(key)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+
+    stats = cache.get_stats()
+    assert stats.entries == 256
+    assert stats.hits + stats.misses <= 8 * 2000
@@ -0,0 +1,214 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from joystick import AsyncFileCache, SyncFileCache
+from joystick._async.client import AsyncClient
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+@pytest.mark.asyncio
+async def test_file_cache_get_set(tmp_path):
+    cache = AsyncFileCache(str(tmp_path))
+
+    assert await cache.get('key') is None
+
+    await cache.set('key', {'cid1': {'key': 'value'}}, cache_expiration_seconds=60)
+
+    assert await cache.get('key') == {'cid1': {'key': 'value'}}
+    assert [p.name for p in tmp_path.iterdir()] == ['key.json']
+
+
+@pytest.mark.asyncio
+async def test_file_cache_survives_restart(tmp_path):
+    await AsyncFileCache(str(tmp_path)).set('key', 'value', cache_expiration_seconds=60)
+
+    assert await AsyncFileCache(str(tmp_path)).get('key') == 'value'
+
+
+@pytest.mark.asyncio
+async def test_file_cache_expiration(tmp_path):
+    cache = AsyncFileCache(str(tmp_path))
+    await cache.set('key', 'value', cache_expiration_seconds=60)
+
+    with patch('joystick._async.cache.file.time', return_value=2 ** 40):
+        assert await cache.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_file_cache_keeps_expired_entries(tmp_path):
+    cache = AsyncFileCache(str(tmp_path))
+    await cache.set('key', 'value', cache_expiration_seconds=60)
+
+    with patch('joystick._async.cache.file.time', return_value=2 ** 40):
+        assert await cache.get('key') is None
+        assert await cache.get_expired('key') == 'value'
+
+    assert [p.name for p in tmp_path.iterdir()] == ['key.json']
+    assert await cache.get_expired('missing') is None
+
+
+@pytest.mark.asyncio
+async def test_file_cache_removes_oldest_entries_over_max_entries(tmp_path):
+    cache = AsyncFileCache(str(tmp_path), max_entries=2)
+
+    for i, key in enumerate(['first', 'second', 'third']):
+        await cache.set(key, 'value', cache_expiration_seconds=60)
+        # Distinct modification times even on the file systems with a coarse resolution
+        os.utime(tmp_path / f'{key}.json', ns=(i * 10 ** 9, i * 10 ** 9))
+
+    await cache.set('fourth', 'value', cache_expiration_seconds=60)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['fourth.json', 'third.json']
+    assert await cache.get('first') is None
+
+
+@pytest.mark.asyncio
+async def test_file_cache_removes_entries_over_max_bytes(tmp_path):
+    cache = AsyncFileCache(str(tmp_path), max_bytes=200)
+
+    await cache.set('first', 'v' * 80, cache_expiration_seconds=60)
+    os.utime(tmp_path / 'first.json', ns=(0, 0))
+    await cache.set('second', 'v' * 80, cache_expiration_seconds=60)
+    await cache.set('too large', 'v' * 300, cache_expiration_seconds=60)
+
+    assert await cache.get('first') is None
+    assert await cache.get('second') == 'v' * 80
+    assert await cache.get('too large') is None
+
+
+@pytest.mark.parametrize("options", [{'max_entries': 0}, {'max_entries': 1.5}, {'max_bytes': 0}, {'max_bytes': '1'}])
+def test_file_cache_wrong_options(tmp_path, options):
+    with pytest.raises(ValueError):
+        AsyncFileCache(str(tmp_path), **options)
+
+
+@pytest.mark.asyncio
+async def test_file_cache_sees_updates_from_other_processes(tmp_path):
+    reader = AsyncFileCache(str(tmp_path), read_only=True)
+    writer = AsyncFileCache(str(tmp_path))
+
+    await writer.set('key', 'first', cache_expiration_seconds=60)
+    assert await reader.get('key') == 'first'
+
+    await writer.set('key', 'second value', cache_expiration_seconds=60)
+    assert await reader.get('key') == 'second value'
+
+
+@pytest.mark.asyncio
+async def test_read_only_file_cache_does_not_write(tmp_path):
+    cache = AsyncFileCache(str(tmp_path), read_only=True)
+
+    await cache.set('key', 'value', cache_expiration_seconds=60)
+    await cache.clear()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_read_only_file_cache_keeps_set_entries_until_file_changes(tmp_path):
+    reader = AsyncFileCache(str(tmp_path), read_only=True)
+    writer = AsyncFileCache(str(tmp_path))
+
+    await reader.set('missing', 'refreshed', cache_expiration_seconds=60)
+    assert await reader.get('missing') == 'refreshed'
+
+    await writer.set('key', 'stale', cache_expiration_seconds=60)
+    await reader.set('key', 'refreshed', cache_expiration_seconds=60)
+    assert await reader.get('key') == 'refreshed'
+
+    await writer.set('key', 'written', cache_expiration_seconds=60)
+    assert await reader.get('key') == 'written'
+
+
+@pytest.mark.asyncio
+async def test_file_cache_ignores_corrupted_files(tmp_path):
+    cache = AsyncFileCache(str(tmp_path))
+    (tmp_path / 'key.json').write_text('{"expire_at": ')
+
+    assert await cache.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_file_cache_clear(tmp_path):
+    cache = AsyncFileCache(str(tmp_path))
+    await cache.set('first', 'value', cache_expiration_seconds=60)
+    await cache.set('with unsafe/characters', 'value', cache_expiration_seconds=60)
+
+    await cache.clear()
+
+    assert await cache.get('first') is None
+    assert await cache.get('with unsafe/characters') is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_client_boots_from_snapshot_and_refreshes_in_background(tmp_path):
+    responses = iter([
+        httpx.Response(200, json={'cid1': {'data': 'first'}}),
+        httpx.Response(200, json={'cid1': {'data': 'second'}}),
+    ])
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses)))
+
+    def create_client():
+        return AsyncClient(
+            api_key=VALID_API_KEY,
+            cache=AsyncFileCache(str(tmp_path)),
+            http_client=http_client,
+            cache_expiration_seconds=10,
+            stale_while_revalidate_seconds=3600,
+        )
+
+    assert await create_client().get_content('cid1') == 'first'
+
+    restarted_client = create_client()
+    with patch('joystick._async.client.time', return_value=os.path.getmtime(next(tmp_path.iterdir())) + 60):
+        assert await restarted_client.get_content('cid1') == 'first'
+
+    # Wait for the background refresh
+    for _ in range(100):
+        if 'second' in next(tmp_path.iterdir()).read_text():
+            break
+        await asyncio.sleep(0.01)
+
+    assert await create_client().get_content('cid1') == 'second'
+
+
+@pytest.mark.asyncio
+async def test_client_falls_back_to_expired_snapshot_when_api_is_unavailable(tmp_path):
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': 'first'}}),
+        httpx.ConnectError('Connection refused'),
+    ])
+
+    def create_client(fallback_to_last_known_good):
+        return AsyncClient(
+            api_key=VALID_API_KEY,
+            cache=AsyncFileCache(str(tmp_path)),
+            http_client=http_client,
+            cache_expiration_seconds=10,
+            fallback_to_last_known_good=fallback_to_last_known_good,
+        )
+
+    assert await create_client(False).get_content('cid1') == 'first'
+
+    with patch('joystick._async.cache.file.time', return_value=os.path.getmtime(next(tmp_path.iterdir())) + 60):
+        with pytest.raises(httpx.ConnectError):
+            await create_client(False).get_content('cid1')
+
+        assert await create_client(True).get_content('cid1') == 'first'
+
+    assert len(requests) == 3
+
+
+def test_sync_file_cache_get_set(tmp_path):
+    cache = SyncFileCache(str(tmp_path))
+    cache.set('key', {'key': 'value'}, cache_expiration_seconds=60)
+
+    assert SyncFileCache(str(tmp_path)).get('key') == {'key': 'value'}
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+from joystick import SyncInMemoryCache
+from joystick._async.cache.in_memory import InMemoryCache
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used_entries():
+    cache = InMemoryCache(max_entries=2)
+
+    await cache.set('first', 1, cache_expiration_seconds=60)
+    await cache.set('second', 2, cache_expiration_seconds=60)
+    await cache.get('first')
+    await cache.set('third', 3, cache_expiration_seconds=60)
+
+    assert await cache.get('first') == 1
+    assert await cache.get('second') is None
+    assert await cache.get('third') == 3
+    assert cache.get_stats().evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_by_size():
+    cache = InMemoryCache(max_bytes=100)
+
+    await cache.set('small', {'key': 'value'}, cache_expiration_seconds=60)
+    await cache.set('large', {'key': 'v' * 80}, cache_expiration_seconds=60)
+
+    assert await cache.get('small') is None
+    assert await cache.get('large') == {'key': 'v' * 80}
+    assert cache.get_stats().size_bytes == len('{"key":"' + 'v' * 80 + '"}')
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_does_not_store_entries_larger_than_max_bytes():
+    cache = InMemoryCache(max_bytes=10)
+
+    await cache.set('small', 'value', cache_expiration_seconds=60)
+    await cache.set('large', 'v' * 100, cache_expiration_seconds=60)
+
+    assert await cache.get('small') == 'value'
+    assert await cache.get('large') is None
+    assert cache.get_stats().evictions == 0
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_replacing_entry_updates_size():
+    cache = InMemoryCache(max_bytes=1000)
+
+    await cache.set('key', 'v' * 100, cache_expiration_seconds=60)
+    await cache.set('key', 'v', cache_expiration_seconds=60)
+
+    assert cache.get_stats().size_bytes == 3
+    assert cache.get_stats().entries == 1
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_stats():
+    cache = InMemoryCache()
+
+    await cache.set('key', 'value', cache_expiration_seconds=60)
+    await cache.get('key')
+    await cache.get('missing')
+
+    with patch('joystick._async.cache.in_memory.time', return_value=2 ** 40):
+        await cache.get('key')
+
+    stats = cache.get_stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 2, 0, 0)
+
+
+@pytest.mark.parametrize("options", [{'max_entries': 0}, {'max_entries': 1.5}, {'max_bytes': 0}, {'max_bytes': '1'}, {'max_entries': 2, 'stripes': 3}, {'stripes': 0}, {'max_bytes': 2, 'stripes': 4}])
+def test_in_memory_cache_wrong_options(options):
+    with pytest.raises(ValueError):
+        InMemoryCache(**options)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_keeps_max_entries_by_default():
+    cache = InMemoryCache(max_entries=1000)
+
+    for i in range(1000):
+        await cache.set(f'key{i}', i, cache_expiration_seconds=60)
+
+    stats = cache.get_stats()
+    assert (stats.entries, stats.evictions) == (1000, 0)
+    assert all([await cache.get(f'key{i}') == i for i in range(1000)])
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_splits_limits_between_stripes():
+    cache = InMemoryCache(max_entries=10, stripes=3)
+
+    for i in range(100):
+        await cache.set(f'key{i}', i, cache_expiration_seconds=60)
+
+    stats = cache.get_stats()
+    assert stats.entries == 10
+    assert stats.evictions == 90
+    assert sum([await cache.get(f'key{i}') is not None for i in range(100)]) == 10
+
+
+def test_sync_in_memory_cache_is_thread_safe():
+    cache = SyncInMemoryCache(max_entries=256, stripes=4)
+
+    def work(thread):
+        for i in range(2000):
+            key = f'key{(thread * 7 + i) % 512}'
+            cache.set(key, i, cache_expiration_seconds=60)
+            cache.get(key)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+
+    stats = cache.get_stats()
+    assert stats.entries == 256
+    assert stats.hits + stats.misses == 8 * 2000
@@ -0,0 +1,155 @@
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from joystick import AsyncSharedMemoryCache, Client, SyncSharedMemoryCache
+from joystick.errors.api import ServerError
+
+VALID_API_KEY = 'valid api key'
+
+
+@pytest.fixture
+def cache_name():
+    name = 'joystick-test-' + uuid.uuid4().hex
+    yield name
+    shutil.rmtree(SyncSharedMemoryCache(name).directory, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_cache_is_shared_between_instances(cache_name):
+    first = AsyncSharedMemoryCache(cache_name)
+    second = AsyncSharedMemoryCache(cache_name)
+
+    await first.set('key', {'key': 'value'}, cache_expiration_seconds=60)
+
+    assert await second.get('key') == {'key': 'value'}
+
+
+@pytest.mark.asyncio
+async def test_only_one_instance_refreshes_missing_entry(cache_name):
+    first = AsyncSharedMemoryCache(cache_name, lease_seconds=0.1)
+    second = AsyncSharedMemoryCache(cache_name, lease_seconds=0.1)
+
+    # The first instance gets the lease to refresh the entry
+    assert await first.get('key') is None
+
+    started_at = time.monotonic()
+    await first.set('key', 'value', cache_expiration_seconds=60)
+
+    assert await second.get('key') == 'value'
+    assert time.monotonic() - started_at < 0.1
+
+
+@pytest.mark.asyncio
+async def test_lease_is_taken_over_when_refresh_fails(cache_name):
+    first = AsyncSharedMemoryCache(cache_name, lease_seconds=0.05)
+    second = AsyncSharedMemoryCache(cache_name, lease_seconds=0.05)
+
+    assert await first.get('key') is None
+    [lease_file_name] = os.listdir(first.directory)
+    leased_at = os.path.getmtime(os.path.join(first.directory, lease_file_name))
+
+    # The first instance never sets the entry, so the second one waits for the lease to expire
+    assert await second.get('key') is None
+    assert time.time() - leased_at >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_released_lease_is_taken_immediately(cache_name):
+    first = AsyncSharedMemoryCache(cache_name, lease_seconds=10)
+    second = AsyncSharedMemoryCache(cache_name, lease_seconds=10)
+
+    assert await first.get('key') is None
+    await first.release('key')
+
+    started_at = time.monotonic()
+    assert await second.get('key') is None
+    assert time.monotonic() - started_at < 1
+    # The lease is held by the second instance now, so the first one doesn't release it
+    await first.release('key')
+    assert len(os.listdir(first.directory)) == 1
+
+
+@pytest.mark.asyncio
+async def test_set_does_not_release_lease_of_another_instance(cache_name):
+    first = AsyncSharedMemoryCache(cache_name, lease_seconds=10)
+    second = AsyncSharedMemoryCache(cache_name, lease_seconds=10)
+
+    assert await first.get('key') is None
+    await second.set('key', 'value', cache_expiration_seconds=60)
+
+    assert [name for name in os.listdir(first.directory) if name.endswith('.lease')] != []
+
+    await first.set('key', 'value', cache_expiration_seconds=60)
+
+    assert [name for name in os.listdir(first.directory) if name.endswith('.lease')] == []
+
+
+@pytest.mark.asyncio
+async def test_instance_does_not_wait_for_its_own_lease(cache_name):
+    cache = AsyncSharedMemoryCache(cache_name, lease_seconds=10)
+
+    assert await cache.get('key') is None
+
+    started_at = time.monotonic()
+    assert await cache.get('key') is None
+    assert time.monotonic() - started_at < 1
+
+
+@pytest.mark.asyncio
+async def test_clear_releases_leases(cache_name):
+    cache = AsyncSharedMemoryCache(cache_name)
+    assert await cache.get('key') is None
+
+    await cache.clear()
+
+    assert os.listdir(cache.directory) == []
+
+
+def test_sync_clients_with_shared_memory_cache_make_one_request(cache_name):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        time.sleep(0.1)
+        return httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}})
+
+    def get_content(_):
+        # Every client simulates a separate worker process with its own cache instance
+        client = Client(
+            api_key=VALID_API_KEY,
+            cache=SyncSharedMemoryCache(cache_name),
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+        return client.get_content('cid1')
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(get_content, range(4)))
+
+    assert len(requests) == 1
+    assert responses == [{'key': 'value'}] * 4
+
+
+def test_client_releases_lease_when_request_fails(cache_name):
+    responses = [httpx.Response(503), httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}})]
+
+    def get_content():
+        client = Client(
+            api_key=VALID_API_KEY,
+            cache=SyncSharedMemoryCache(cache_name, lease_seconds=10),
+            http_client=httpx.Client(transport=httpx.MockTransport(lambda request: responses.pop(0))),
+        )
+        return client.get_content('cid1')
+
+    with pytest.raises(ServerError):
+        get_content()
+
+    # Another worker doesn't wait for the lease of the failed request
+    started_at = time.monotonic()
+    assert get_content() == {'key': 'value'}
+    assert time.monotonic() - started_at < 1
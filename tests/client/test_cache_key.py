@@ -0,0 +1,108 @@
+import json
+
+import httpx
+import pytest
+
+from joystick._async.cache_key_builder import CacheKeyBuilder, build_cache_key
+from joystick._async.client import AsyncClient
+from joystick._async.params_dict import ParamsDict
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+@pytest.mark.parametrize('additional_segments', [
+    [],
+    [['cid1', 'cid2'], False, False],
+    ['cid1', True, True],
+    [['ключ', 'cid "quoted"'], None, {'nested': [1, 2.5]}],
+])
+def test_cache_key_builder_builds_same_keys_as_build_cache_key(additional_segments):
+    context = {
+        'api_key': VALID_API_KEY,
+        'sem_ver': '1.2.3',
+        'user_id': 'user',
+        'params': ParamsDict({'b': 2, 'a': 'ä'}),
+    }
+
+    assert CacheKeyBuilder(**context).build(additional_segments) == build_cache_key(
+        **context, additional_segments=additional_segments,
+    )
+
+
+def test_params_dict_version_changes_on_every_mutation():
+    params = ParamsDict({'a': 1})
+    versions = [params.version]
+
+    params['b'] = 2
+    versions.append(params.version)
+    del params['b']
+    versions.append(params.version)
+    params.update({'c': 3})
+    versions.append(params.version)
+    params.setdefault('d', 4)
+    versions.append(params.version)
+    params.pop('d')
+    versions.append(params.version)
+    params.popitem()
+    versions.append(params.version)
+    params.clear()
+    versions.append(params.version)
+
+    assert len(set(versions)) == len(versions)
+
+
+@pytest.mark.asyncio
+async def test_cache_key_follows_client_context_changes():
+    http_client, requests = mock_http_client([httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}})])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        params={'param': 'value'},
+        http_client=http_client,
+    )
+
+    await client.get_content('cid1')
+    await client.get_content('cid1')
+    assert len(requests) == 1
+
+    client.params['param'] = 'other value'
+    await client.get_content('cid1')
+    assert len(requests) == 2
+
+    client.params.update({'param': 'value'})
+    await client.get_content('cid1')
+    assert len(requests) == 2
+
+    client.user_id = 'user'
+    await client.get_content('cid1')
+    assert len(requests) == 3
+
+    client.sem_ver = '1.0.0'
+    await client.get_content('cid1')
+    assert len(requests) == 4
+
+    client.params = {'param': 'value'}
+    client.user_id = ''
+    client.sem_ver = ''
+    await client.get_content('cid1')
+    assert len(requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_params_are_copied_when_assigned():
+    http_client, requests = mock_http_client([httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}})])
+    tags = ['a']
+    client = AsyncClient(api_key=VALID_API_KEY, params={'tags': tags}, http_client=http_client)
+
+    await client.get_content('cid1')
+
+    # The nested values of the provided params don't affect the client
+    tags.append('b')
+    await client.get_content('cid1', refresh=True)
+    assert json.loads(requests[1].content)['p'] == {'tags': ['a']}
+
+    client.params = {'tags': tags}
+    await client.get_content('cid1')
+    assert len(requests) == 3
+    assert json.loads(requests[2].content)['p'] == {'tags': ['a', 'b']}
@@ -0,0 +1,71 @@
+import json
+
+import httpx
+import pytest
+
+from joystick._async.client import AsyncClient
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+def respond(request):
+    return httpx.Response(200, json={'cid1': {'data': {'country': json.loads(request.content)['p'].get('country')}}})
+
+
+@pytest.mark.asyncio
+async def test_only_cache_key_params_fragment_the_cache():
+    http_client, requests = mock_http_client([respond])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        params={'country': 'US', 'request_id': '1'},
+        cache_key_params={'country'},
+        http_client=http_client,
+    )
+
+    assert await client.get_content('cid1') == {'country': 'US'}
+
+    client.params['request_id'] = '2'
+    assert await client.get_content('cid1') == {'country': 'US'}
+    assert await client.with_context(params={'country': 'US', 'request_id': '3'}).get_content('cid1') == {'country': 'US'}
+    assert len(requests) == 1
+
+    client.params['country'] = 'DE'
+    assert await client.get_content('cid1') == {'country': 'DE'}
+    assert len(requests) == 2
+    # All the params are still sent to Joystick API
+    assert json.loads(requests[1].content)['p'] == {'country': 'DE', 'request_id': '2'}
+
+
+@pytest.mark.asyncio
+async def test_all_params_fragment_the_cache_by_default():
+    http_client, requests = mock_http_client([respond])
+    client = AsyncClient(api_key=VALID_API_KEY, params={'request_id': '1'}, http_client=http_client)
+
+    await client.get_content('cid1')
+    client.params['request_id'] = '2'
+    await client.get_content('cid1')
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_changing_cache_key_params_changes_the_key():
+    http_client, requests = mock_http_client([respond])
+    client = AsyncClient(api_key=VALID_API_KEY, params={'request_id': '1'}, http_client=http_client)
+
+    await client.get_content('cid1')
+    client.cache_key_params = []
+    await client.get_content('cid1')
+    client.params['request_id'] = '2'
+    await client.get_content('cid1')
+
+    assert len(requests) == 2
+
+
+def test_cache_key_params_validation():
+    with pytest.raises(ValueError):
+        AsyncClient(api_key=VALID_API_KEY, cache_key_params='country')
+    with pytest.raises(ValueError):
+        AsyncClient(api_key=VALID_API_KEY, cache_key_params=[1])
@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from joystick import CircuitBreaker
+from joystick._async.client import AsyncClient
+from joystick.errors import BadRequestError, CircuitOpenError, ServerError
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+SUCCESS_RESPONSE = {'cid1': {'data': {'key': 'value'}}}
+
+
+def test_circuit_breaker_opens_after_failure_threshold():
+    circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout_seconds=60)
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.allow_request()
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+    assert not circuit_breaker.allow_request()
+
+
+def test_circuit_breaker_lets_single_trial_request_after_recovery_timeout():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout_seconds=0)
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.allow_request()
+    assert circuit_breaker.state == CircuitBreaker.HALF_OPEN
+
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_failed_trial_request_opens_circuit_again():
+    circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout_seconds=0)
+    for _ in range(5):
+        circuit_breaker.record_failure()
+
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+
+    assert circuit_breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.parametrize("options", [{'failure_threshold': 0}, {'recovery_timeout_seconds': -1}])
+def test_wrong_circuit_breaker_options(options):
+    with pytest.raises(ValueError):
+        CircuitBreaker(**options)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    http_client, requests = mock_http_client([httpx.ReadTimeout('Timeout'), httpx.Response(503)])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=http_client,
+        circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout_seconds=60),
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        await client.get_content('cid1')
+    with pytest.raises(ServerError):
+        await client.get_content('cid1')
+    with pytest.raises(CircuitOpenError):
+        await client.get_content('cid1')
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_circuit():
+    http_client, requests = mock_http_client([httpx.Response(404)])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=http_client,
+        circuit_breaker=CircuitBreaker(failure_threshold=1),
+    )
+
+    for _ in range(3):
+        with pytest.raises(BadRequestError):
+            await client.get_content('cid1')
+
+    assert len(requests) == 3
@@ -0,0 +1,79 @@
+import gzip
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from joystick import AsyncTransport, SyncTransport
+from joystick._async.client import AsyncClient
+from joystick._sync.transport import get_supported_encodings
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+def gzip_response(content=json.dumps({'cid1': {'data': {'key': 'value'}}}).encode()):
+    return httpx.Response(200, content=gzip.compress(content), headers={'Content-Encoding': 'gzip'})
+
+
+@pytest.mark.asyncio
+async def test_default_accept_encoding_is_httpx_default():
+    http_client, requests = mock_http_client([gzip_response()])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client)
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert 'gzip' in requests[0].headers['Accept-Encoding']
+
+
+@pytest.mark.asyncio
+async def test_accept_encoding_option_is_sent():
+    http_client, requests = mock_http_client([gzip_response()])
+    transport = AsyncTransport(http_client=http_client, accept_encoding=['gzip'])
+    client = AsyncClient(api_key=VALID_API_KEY, transport=transport)
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert requests[0].headers['Accept-Encoding'] == 'gzip'
+
+
+def test_unsupported_accept_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        SyncTransport(accept_encoding=['unknown'])
+    with pytest.raises(ValueError):
+        SyncTransport(accept_encoding=[])
+
+
+def test_optional_encodings_require_their_libraries():
+    with patch('importlib.util.find_spec', return_value=None):
+        assert get_supported_encodings() == ['identity', 'gzip', 'deflate']
+        with pytest.raises(ValueError):
+            SyncTransport(accept_encoding=['br'])
+        with pytest.raises(ValueError):
+            SyncTransport(accept_encoding=['zstd'])
+
+
+@pytest.mark.asyncio
+async def test_large_put_body_is_compressed():
+    http_client, requests = mock_http_client([gzip_response(b'{}')])
+    transport = AsyncTransport(http_client=http_client, compress_request_body=True)
+    client = AsyncClient(api_key=VALID_API_KEY, transport=transport)
+
+    content = {'items': ['item %d' % i for i in range(1000)]}
+    await client.publish_content_update('cid1', 'description', content)
+    await client.publish_content_update('cid1', 'description', {'small': True})
+
+    assert requests[0].headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(requests[0].content))['c'] == content
+    assert 'Content-Encoding' not in requests[1].headers
+    assert json.loads(requests[1].content)['c'] == {'small': True}
+
+
+@pytest.mark.asyncio
+async def test_put_body_is_not_compressed_by_default():
+    http_client, requests = mock_http_client([gzip_response(b'{}')])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client)
+
+    await client.publish_content_update('cid1', 'description', {'items': ['item %d' % i for i in range(1000)]})
+
+    assert 'Content-Encoding' not in requests[0].headers
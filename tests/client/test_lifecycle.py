@@ -0,0 +1,70 @@
+import httpx
+import pytest
+from mock import AsyncMock
+
+from joystick import AsyncTransport, Client
+from joystick._async.client import AsyncClient
+from joystick._async.cache.in_memory import InMemoryCache
+
+VALID_API_KEY = 'valid api key'
+
+
+@pytest.mark.asyncio
+async def test_context_manager_closes_transport():
+    async with AsyncClient(api_key=VALID_API_KEY) as client:
+        transport = client._AsyncClient__transport
+        http_client = transport._AsyncTransport__client
+        assert not http_client.is_closed
+
+    assert http_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_cache_and_stops_background_refresh():
+    cache = InMemoryCache()
+    cache.aclose = AsyncMock()
+
+    client = AsyncClient(api_key=VALID_API_KEY, cache=cache)
+    await client.start_background_refresh(refresh_interval_seconds=60)
+
+    await client.aclose()
+
+    cache.aclose.assert_awaited_once_with()
+    assert client._AsyncClient__background_refresh is None
+
+
+@pytest.mark.asyncio
+async def test_aclose_does_not_close_provided_http_client():
+    http_client = httpx.AsyncClient()
+
+    async with AsyncClient(api_key=VALID_API_KEY, http_client=http_client):
+        pass
+
+    assert not http_client.is_closed
+    await http_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_does_not_close_shared_resources():
+    transport = AsyncTransport()
+    transport.aclose = AsyncMock()
+    cache = InMemoryCache()
+    cache.aclose = AsyncMock()
+
+    client = AsyncClient(api_key=VALID_API_KEY, transport=transport, cache=cache)
+    await client.with_context(user_id='user').aclose()
+
+    cache.aclose.assert_not_awaited()
+
+    await client.aclose()
+
+    cache.aclose.assert_awaited_once_with()
+    transport.aclose.assert_not_awaited()
+
+
+def test_sync_context_manager_closes_transport():
+    with Client(api_key=VALID_API_KEY) as client:
+        http_client = client._Client__transport._SyncTransport__client
+        assert not http_client.is_closed
+
+    assert http_client.is_closed
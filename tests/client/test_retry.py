@@ -0,0 +1,111 @@
+import httpx
+import pytest
+
+from joystick import Client, RetryPolicy
+from joystick._async.client import AsyncClient
+from joystick.errors import BadRequestError, ServerError
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+SUCCESS_RESPONSE = {'cid1': {'data': {'key': 'value'}}}
+
+
+def retry_policy(**options):
+    return RetryPolicy(**{'backoff_seconds': 0, 'max_backoff_seconds': 0, **options})
+
+
+@pytest.mark.asyncio
+async def test_retry_on_server_error():
+    http_client, requests = mock_http_client([httpx.Response(503), httpx.Response(200, json=SUCCESS_RESPONSE)])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, retry_policy=retry_policy())
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_on_connection_error():
+    http_client, requests = mock_http_client([httpx.ConnectError('Connection reset'), httpx.Response(200, json=SUCCESS_RESPONSE)])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, retry_policy=retry_policy())
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_no_retry_on_bad_request():
+    http_client, requests = mock_http_client([httpx.Response(400)])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, retry_policy=retry_policy())
+
+    with pytest.raises(BadRequestError):
+        await client.get_content('cid1')
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_no_retry_without_retry_policy():
+    http_client, requests = mock_http_client([httpx.Response(503)])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client)
+
+    with pytest.raises(ServerError):
+        await client.get_content('cid1')
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_after_max_attempts():
+    http_client, requests = mock_http_client([httpx.Response(503)])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, retry_policy=retry_policy(max_attempts=4))
+
+    with pytest.raises(ServerError):
+        await client.get_content('cid1')
+    assert len(requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_when_budget_is_exhausted():
+    http_client, requests = mock_http_client([httpx.Response(503)])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=http_client,
+        retry_policy=retry_policy(max_attempts=10, budget_min_retries=3, budget_ratio=0),
+    )
+
+    with pytest.raises(ServerError):
+        await client.get_content('cid1')
+    assert len(requests) == 4
+
+    with pytest.raises(ServerError):
+        await client.get_content('cid1', refresh=True)
+    assert len(requests) == 5
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(backoff_seconds=0.1, max_backoff_seconds=1)
+
+    assert all(0 <= policy.get_backoff_seconds(attempt) <= 0.1 for attempt in [0] * 100)
+    assert all(0 <= policy.get_backoff_seconds(attempt) <= 1 for attempt in range(100))
+
+
+def wrong_retry_policies():
+    return [
+        {'max_attempts': 0},
+        {'backoff_seconds': -1},
+        {'backoff_seconds': 3, 'max_backoff_seconds': 2},
+        {'budget_ratio': -0.1},
+    ]
+
+
+@pytest.mark.parametrize("options", wrong_retry_policies())
+def test_wrong_retry_policy(options):
+    with pytest.raises(ValueError):
+        RetryPolicy(**options)
+
+
+def test_sync_retry_on_server_error():
+    http_client, requests = mock_http_client([httpx.Response(502), httpx.Response(200, json=SUCCESS_RESPONSE)], httpx.Client)
+    client = Client(api_key=VALID_API_KEY, http_client=http_client, retry_policy=retry_policy())
+
+    assert client.get_content('cid1') == {'key': 'value'}
+    assert len(requests) == 2
@@ -0,0 +1,68 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from joystick import AsyncTransport
+from joystick._async.client import AsyncClient
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+def respond(request):
+    return httpx.Response(200, json={'cid1': {'data': {'user': json.loads(request.content)['u']}}})
+
+
+@pytest.mark.asyncio
+async def test_with_context_shares_transport_and_cache():
+    http_client, requests = mock_http_client([respond])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, params={'param': 'value'})
+
+    with patch('joystick._async.transport.httpx.AsyncClient') as HttpClientMock:
+        first_user = client.with_context(user_id='first')
+        second_user = client.with_context(user_id='second', params={'other': 'value'})
+
+    HttpClientMock.assert_not_called()
+    assert first_user.cache is client.cache
+    assert first_user.params == {'param': 'value'}
+    assert second_user.params == {'other': 'value'}
+
+    assert await first_user.get_content('cid1') == {'user': 'first'}
+    assert await second_user.get_content('cid1') == {'user': 'second'}
+    assert await first_user.get_content('cid1') == {'user': 'first'}
+
+    assert len(requests) == 2
+    assert json.loads(requests[1].content) == {'u': 'second', 'p': {'other': 'value'}}
+
+
+@pytest.mark.asyncio
+async def test_with_context_does_not_change_parent_client():
+    client = AsyncClient(api_key=VALID_API_KEY, user_id='parent', params={'param': 'value'})
+
+    context = client.with_context(user_id='child')
+    context.params['param'] = 'changed'
+
+    assert client.user_id == 'parent'
+    assert client.params == {'param': 'value'}
+
+
+@pytest.mark.asyncio
+async def test_transport_is_shared_by_clients_with_different_api_keys():
+    http_client, requests = mock_http_client([respond])
+    transport = AsyncTransport(http_client=http_client)
+
+    first_client = AsyncClient(api_key='first api key', transport=transport)
+    second_client = AsyncClient(api_key='second api key', transport=transport)
+
+    await first_client.get_content('cid1')
+    await second_client.get_content('cid1')
+
+    assert [request.headers['x-api-key'] for request in requests] == ['first api key', 'second api key']
+
+
+def test_transport_conflicts_with_http_options():
+    with pytest.raises(ValueError):
+        AsyncClient(api_key=VALID_API_KEY, transport=AsyncTransport(), http2=True)
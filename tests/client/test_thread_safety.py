@@ -0,0 +1,37 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from joystick import Client, SyncInMemoryCache
+
+from tests.get_contents.fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+def respond(request):
+    user_id = json.loads(request.content)['u']
+    return httpx.Response(200, json={'cid1': {'data': {'user_id': user_id}}}, headers={'ETag': f'"{user_id}"'})
+
+
+def test_client_is_shared_between_threads():
+    http_client, requests = mock_http_client([respond], httpx.Client)
+    client = Client(
+        api_key=VALID_API_KEY,
+        cache=SyncInMemoryCache(max_entries=8, stripes=2),
+        fallback_to_last_known_good=True,
+        conditional_requests=True,
+        http_client=http_client,
+    )
+
+    def work(i):
+        user_id = f'user{i % 32}'
+        return user_id, client.with_context(user_id=user_id).get_content('cid1')
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(work, range(400)))
+
+    assert all(content == {'user_id': user_id} for user_id, content in results)
+    # The cache is smaller than the number of users, so some of the results are requested again
+    assert 32 <= len(requests) < 400
@@ -0,0 +1,47 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+from joystick._async.client import AsyncClient
+
+VALID_API_KEY = 'valid api key'
+
+
+@pytest.mark.asyncio
+async def test_provided_http_client_is_used():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client)
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert len(requests) == 1
+    assert requests[0].headers['x-api-key'] == VALID_API_KEY
+
+
+def test_transport_options_are_passed_to_http_client():
+    limits = httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30)
+    timeout = httpx.Timeout(1.0, connect=0.5)
+
+    with patch('joystick._async.transport.httpx.AsyncClient') as HttpClientMock:
+        AsyncClient(api_key=VALID_API_KEY, http2=True, limits=limits, timeout=timeout)
+
+    HttpClientMock.assert_called_once_with(http2=True, limits=limits, timeout=timeout)
+
+
+def conflicting_transport_options():
+    return [
+        {'http2': True},
+        {'limits': httpx.Limits(max_connections=10)},
+        {'timeout': httpx.Timeout(1.0)},
+    ]
+
+
+@pytest.mark.parametrize("options", conflicting_transport_options())
+def test_transport_options_conflict_with_provided_http_client(options):
+    with pytest.raises(ValueError):
+        AsyncClient(api_key=VALID_API_KEY, http_client=httpx.AsyncClient(), **options)
@@ -1,5 +1,8 @@
 import pytest
 import json
+import threading
+
+import httpx
 
 
 @pytest.fixture
@@ -83,3 +86,22 @@ def api_response_get_contents_serialized():
             }
         }
     })
+
+
+def mock_http_client(responses, http_client_class=httpx.AsyncClient):
+    # Returns the responses (or raises the exceptions) in order, and then repeats the last one. A
+    # response can also be a function of the request
+    requests = []
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            requests.append(request)
+            response = responses[min(len(requests), len(responses)) - 1]
+        if callable(response):
+            response = response(request)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return http_client_class(transport=httpx.MockTransport(handler)), requests
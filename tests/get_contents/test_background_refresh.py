@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+from httpx import Response
+import pytest
+
+from joystick import Client
+from joystick._async.client import AsyncClient
+from joystick.errors.api import ServerError
+
+from .fixtures import api_response_get_contents, valid_content_ids, valid_api_key
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                               Background refresh                               ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_background_refresh_preloads_and_refreshes_contents(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+    client.add_warm_contents(valid_content_ids)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    await client.start_background_refresh(refresh_interval_seconds=0.02)
+
+    assert combine_api_call.call_count == 1
+
+    await client.get_contents(content_ids=valid_content_ids)
+
+    assert combine_api_call.call_count == 1
+
+    await asyncio.sleep(0.1)
+    await client.stop_background_refresh()
+
+    refreshed_count = combine_api_call.call_count
+    assert refreshed_count > 1
+
+    await asyncio.sleep(0.05)
+
+    assert combine_api_call.call_count == refreshed_count
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_stop_background_refresh_cancels_running_refresh(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+    client.add_warm_contents(valid_content_ids)
+    responses = [Response(200, content=api_response_get_contents)]
+
+    async def respond(request):
+        if responses:
+            return responses.pop()
+        await asyncio.sleep(10)
+
+    respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=respond)
+
+    await client.start_background_refresh(refresh_interval_seconds=0.01)
+    await asyncio.sleep(0.05)
+
+    # The cancellation of the running refresh is not swallowed as its failure
+    await asyncio.wait_for(client.stop_background_refresh(), 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_background_refresh_keeps_running_after_failed_preload(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+    client.add_warm_contents(valid_content_ids)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=[
+        Response(500, content="Internal Server Error"),
+        Response(200, content=api_response_get_contents),
+    ])
+
+    with pytest.raises(ServerError):
+        await client.start_background_refresh(refresh_interval_seconds=0.02)
+
+    await asyncio.sleep(0.05)
+    await client.stop_background_refresh()
+
+    assert combine_api_call.call_count == 2
+
+    await client.get_contents(content_ids=valid_content_ids)
+
+    assert combine_api_call.call_count == 2
+
+
+def wrong_refresh_options():
+    return [
+        # Refresh interval, jitter
+        (0, 0),
+        (-1, 0),
+        (10, -1),
+        (10, 10),
+    ]
+
+
+@pytest.mark.parametrize("refresh_interval_seconds,jitter_seconds", wrong_refresh_options())
+@pytest.mark.asyncio
+async def test_background_refresh_wrong_options(valid_api_key, refresh_interval_seconds, jitter_seconds):
+    client = AsyncClient(api_key=valid_api_key)
+
+    with pytest.raises(ValueError):
+        await client.start_background_refresh(refresh_interval_seconds=refresh_interval_seconds, jitter_seconds=jitter_seconds)
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_default_interval_requires_cache_expiration(valid_api_key):
+    client = AsyncClient(api_key=valid_api_key, cache_expiration_seconds=0)
+
+    with pytest.raises(ValueError):
+        await client.start_background_refresh()
+
+
+@pytest.mark.respx()
+def test_sync_background_refresh_runs_in_worker_thread(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = Client(api_key=valid_api_key)
+    client.add_warm_contents(valid_content_ids)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    client.start_background_refresh(refresh_interval_seconds=0.02, jitter_seconds=0.01)
+
+    assert combine_api_call.call_count == 1
+
+    time.sleep(0.1)
+    client.stop_background_refresh()
+
+    refreshed_count = combine_api_call.call_count
+    assert refreshed_count > 1
+
+    time.sleep(0.05)
+
+    assert combine_api_call.call_count == refreshed_count
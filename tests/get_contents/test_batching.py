@@ -0,0 +1,151 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from httpx import Response
+import pytest
+
+from joystick import Client
+from joystick._async.client import AsyncClient
+from joystick.errors.api import MultipleContentsApiError
+
+from .fixtures import api_response_get_contents, mock_http_client, valid_api_key
+
+
+def respond_with_requested_contents(request):
+    content_ids = json.loads(request.url.params['c'])
+    return Response(200, json=dict((cid, {'data': {'id': cid}}) for cid in content_ids))
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                              get_content batching                              ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_content_concurrent_calls_are_batched(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, batch_window_seconds=0.01)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    first, second = await asyncio.gather(client.get_content('cid1'), client.get_content('cid2'))
+
+    assert combine_api_call.call_count == 1
+    assert first['contentId'] == 'cid1'
+    assert second['contentId'] == 'cid2'
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_content_batch_is_sent_when_max_size_is_reached(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, batch_window_seconds=10, batch_max_size=2)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    await asyncio.wait_for(asyncio.gather(client.get_content('cid1'), client.get_content('cid2')), 1)
+
+    assert combine_api_call.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_content_calls_with_different_options_are_not_batched_together(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, batch_window_seconds=0.01)
+
+    response = json.loads(api_response_get_contents)
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\"]&dynamic=true",
+    ).mock(return_value=Response(200, json={'cid1': response['cid1']}))
+    combine_api_call_full = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, json={'cid2': response['cid2']}))
+
+    first, second = await asyncio.gather(client.get_content('cid1'), client.get_content('cid2', full_response=True))
+
+    assert combine_api_call.call_count == 1
+    assert combine_api_call_full.call_count == 1
+    assert 'data' in second
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_content_failed_content_does_not_fail_the_whole_batch(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, batch_window_seconds=0.01)
+
+    response = json.loads(api_response_get_contents)
+    respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, json={'cid1': 'Error 404', 'cid2': response['cid2']}))
+    respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\"]&dynamic=true",
+    ).mock(return_value=Response(200, json={'cid1': 'Error 404'}))
+    respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, json={'cid2': response['cid2']}))
+
+    first, second = await asyncio.gather(client.get_content('cid1'), client.get_content('cid2'), return_exceptions=True)
+
+    assert isinstance(first, MultipleContentsApiError)
+    assert second['contentId'] == 'cid2'
+
+
+@pytest.mark.asyncio
+async def test_get_content_batches_never_exceed_max_size(valid_api_key):
+    http_client, requests = mock_http_client([respond_with_requested_contents])
+    client = AsyncClient(api_key=valid_api_key, batch_window_seconds=0.1, batch_max_size=100, http_client=http_client)
+
+    content_ids = ['cid%d' % i for i in range(250)]
+    results = await asyncio.wait_for(asyncio.gather(*(client.get_content(cid) for cid in content_ids)), 1)
+
+    assert results == [{'id': cid} for cid in content_ids]
+    assert sorted(len(json.loads(request.url.params['c'])) for request in requests) == [50, 100, 100]
+
+
+def wrong_batch_options():
+    return [
+        {'batch_window_seconds': -1},
+        {'batch_window_seconds': '0.1'},
+        {'batch_max_size': 0},
+        {'batch_max_size': 1.5},
+    ]
+
+
+@pytest.mark.parametrize("options", wrong_batch_options())
+def test_wrong_batch_options(valid_api_key, options):
+    with pytest.raises(ValueError):
+        AsyncClient(api_key=valid_api_key, **options)
+
+
+@pytest.mark.respx()
+def test_sync_get_content_concurrent_calls_are_batched(respx_mock, valid_api_key, api_response_get_contents):
+    client = Client(api_key=valid_api_key, batch_window_seconds=0.1)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.map(client.get_content, ['cid1', 'cid2'])
+
+    assert combine_api_call.call_count == 1
+    assert first['contentId'] == 'cid1'
+    assert second['contentId'] == 'cid2'
+
+
+def test_sync_get_content_batches_never_exceed_max_size(valid_api_key):
+    http_client, requests = mock_http_client([respond_with_requested_contents], httpx.Client)
+    client = Client(api_key=valid_api_key, batch_window_seconds=0.2, batch_max_size=10, http_client=http_client)
+
+    content_ids = ['cid%d' % i for i in range(50)]
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        results = list(executor.map(client.get_content, content_ids))
+
+    assert results == [{'id': cid} for cid in content_ids]
+    assert sum(len(json.loads(request.url.params['c'])) for request in requests) == 50
+    assert all(len(json.loads(request.url.params['c'])) <= 10 for request in requests)
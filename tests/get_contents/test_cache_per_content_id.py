@@ -0,0 +1,75 @@
+import json
+
+from httpx import Response
+import pytest
+
+from joystick._async.client import AsyncClient
+
+from .fixtures import api_response_get_contents, valid_api_key
+
+
+def api_response_for(api_response_get_contents, content_ids):
+    response = json.loads(api_response_get_contents)
+    return json.dumps(dict((content_id, response[content_id]) for content_id in content_ids))
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                             Cache per content ID                               ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_requests_only_missing_content_ids(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, cache_per_content_id=True)
+
+    first_content_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_for(api_response_get_contents, ['cid1'])))
+    second_content_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_for(api_response_get_contents, ['cid2'])))
+
+    response_first = await client.get_contents(content_ids={'cid1'})
+    response_both = await client.get_contents(content_ids={'cid1', 'cid2'})
+
+    assert first_content_call.call_count == 1
+    assert second_content_call.call_count == 1
+    assert response_both['cid1'] == response_first['cid1']
+    assert set(response_both.keys()) == {'cid1', 'cid2'}
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_serves_subsets_from_cache(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, cache_per_content_id=True)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    response_both = await client.get_contents(content_ids={'cid1', 'cid2'})
+    response_first = await client.get_contents(content_ids={'cid1'})
+    response_second = await client.get_content('cid2')
+
+    assert combine_api_call.call_count == 1
+    assert response_first == {'cid1': response_both['cid1']}
+    assert response_second == response_both['cid2']
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_per_content_id_respects_options(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, cache_per_content_id=True)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    response = await client.get_contents(content_ids={'cid1', 'cid2'})
+    response_full = await client.get_contents(content_ids={'cid1', 'cid2'}, full_response=True)
+    response_refreshed = await client.get_contents(content_ids={'cid1', 'cid2'}, refresh=True)
+
+    assert combine_api_call.call_count == 3
+    assert response_full['cid1']['data'] == response['cid1']
+    assert response_refreshed == response
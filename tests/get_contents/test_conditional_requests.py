@@ -0,0 +1,130 @@
+import json
+
+import httpx
+import pytest
+from mock import patch
+
+from joystick import Client
+from joystick._async.client import AsyncClient
+
+VALID_API_KEY = 'valid api key'
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                              Conditional requests                              ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+class StubApi:
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.title = 'first'
+        self.requests = []
+
+    def body(self, content_ids):
+        return json.dumps(dict((cid, {'data': {'title': self.title}}) for cid in content_ids))
+
+    def handler(self, request):
+        self.requests.append(request)
+        content_ids = json.loads(request.url.params['c'])
+        etag = None if self.etag is None else '"%s-%s"' % (self.etag, self.title)
+
+        if etag is not None and request.headers.get('If-None-Match') == etag:
+            return httpx.Response(304, headers={'ETag': etag})
+
+        return httpx.Response(200, content=self.body(content_ids), headers={'ETag': etag} if etag is not None else {})
+
+
+@pytest.mark.asyncio
+async def test_not_modified_response_reuses_previous_result():
+    api = StubApi(etag='v')
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        conditional_requests=True,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)),
+    )
+
+    first = await client.get_contents({'cid1', 'cid2'})
+    second = await client.get_contents({'cid1', 'cid2'}, refresh=True)
+
+    assert second is first
+    assert 'If-None-Match' not in api.requests[0].headers
+    assert api.requests[1].headers['If-None-Match'] == '"v-first"'
+
+    api.title = 'second'
+    third = await client.get_contents({'cid1', 'cid2'}, refresh=True)
+
+    assert third == {'cid1': {'title': 'second'}, 'cid2': {'title': 'second'}}
+    assert api.requests[2].headers['If-None-Match'] == '"v-first"'
+
+
+@pytest.mark.asyncio
+async def test_unchanged_content_is_not_decoded_again():
+    api = StubApi()
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        conditional_requests=True,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)),
+    )
+
+    first = await client.get_contents({'cid1'})
+
+    with patch.object(client.cache, 'set', wraps=client.cache.set) as cache_set, \
+            patch('joystick.json_codec.StandardJsonCodec.loads') as loads, \
+            patch('joystick.json_codec.OrjsonCodec.loads') as orjson_loads:
+        second = await client.get_contents({'cid1'}, refresh=True)
+
+    assert second is first
+    loads.assert_not_called()
+    orjson_loads.assert_not_called()
+    # The TTL of the cached result is extended
+    cache_set.assert_called_once()
+
+    api.title = 'second'
+    assert await client.get_contents({'cid1'}, refresh=True) == {'cid1': {'title': 'second'}}
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_per_content_id():
+    api = StubApi(etag='v')
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        conditional_requests=True,
+        cache_per_content_id=True,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)),
+    )
+
+    first = await client.get_contents({'cid1', 'cid2'})
+    second = await client.get_contents({'cid1', 'cid2'}, refresh=True)
+
+    assert second == first
+    assert api.requests[1].headers['If-None-Match'] == '"v-first"'
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_are_disabled_by_default():
+    api = StubApi(etag='v')
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handler)),
+    )
+
+    first = await client.get_contents({'cid1'})
+    second = await client.get_contents({'cid1'}, refresh=True)
+
+    assert second == first and second is not first
+    assert all('If-None-Match' not in request.headers for request in api.requests)
+
+
+def test_sync_not_modified_response_reuses_previous_result():
+    api = StubApi(etag='v')
+    client = Client(
+        api_key=VALID_API_KEY,
+        conditional_requests=True,
+        http_client=httpx.Client(transport=httpx.MockTransport(api.handler)),
+    )
+
+    first = client.get_contents({'cid1'})
+
+    assert client.get_contents({'cid1'}, refresh=True) is first
+    assert api.requests[1].headers['If-None-Match'] == '"v-first"'
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from joystick import Client
+from joystick._async.client import AsyncClient
+from joystick.errors.api import BadRequestError
+
+VALID_API_KEY = 'valid api key'
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                              Contents for many users                           ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+def response_for(request):
+    body = json.loads(request.content)
+    if body['u'] == 'invalid':
+        return httpx.Response(400, content='Bad request')
+    return httpx.Response(200, json={'cid1': {'data': {'user': body['u'], 'params': body['p']}}})
+
+
+@pytest.mark.asyncio
+async def test_get_contents_for_users_yields_results_in_order_with_bounded_concurrency():
+    requests = []
+    in_progress = []
+    max_in_progress = []
+
+    async def handler(request):
+        requests.append(request)
+        in_progress.append(request)
+        max_in_progress.append(len(in_progress))
+        await asyncio.sleep(0.01)
+        in_progress.remove(request)
+        return response_for(request)
+
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        params={'default': 'value'},
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    users = [('user-%d' % (i % 10), {'i': i % 10} if i % 10 == 1 else None) for i in range(30)]
+    results = [result async for result in client.get_contents_for_users({'cid1'}, users, concurrency=4)]
+
+    assert [(result.user_id, result.params) for result in results] == users
+    assert all(result.error is None for result in results)
+    assert results[0].contents == {'cid1': {'user': 'user-0', 'params': {'default': 'value'}}}
+    assert results[1].contents == {'cid1': {'user': 'user-1', 'params': {'i': 1}}}
+    # Every context is requested once, the repeated ones are served from the cache
+    assert len(requests) == 10
+    assert max(max_in_progress) <= 4
+
+
+@pytest.mark.asyncio
+async def test_get_contents_for_users_raises_error_or_returns_it():
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(response_for)),
+    )
+    users = [('first', None), ('invalid', None), ('second', None)]
+
+    with pytest.raises(BadRequestError):
+        [result async for result in client.get_contents_for_users({'cid1'}, users)]
+
+    results = [result async for result in client.get_contents_for_users({'cid1'}, users, return_exceptions=True)]
+    assert results[0].contents is not None
+    assert results[1].contents is None and isinstance(results[1].error, BadRequestError)
+    assert results[2].contents is not None
+
+
+def test_get_contents_for_users_validates_options():
+    client = AsyncClient(api_key=VALID_API_KEY)
+
+    with pytest.raises(ValueError):
+        client.get_contents_for_users({'cid1'}, [], concurrency=0)
+    with pytest.raises(AssertionError):
+        client.get_contents_for_users(['cid1'], [])
+
+
+def test_sync_get_contents_for_users_consumes_users_lazily():
+    threads = set()
+    consumed = []
+
+    def handler(request):
+        threads.add(threading.current_thread())
+        time.sleep(0.01)
+        return response_for(request)
+
+    def users():
+        for i in range(20):
+            consumed.append(i)
+            yield 'user-%d' % i, None
+
+    client = Client(api_key=VALID_API_KEY, http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    results = client.get_contents_for_users({'cid1'}, users(), concurrency=3)
+    first = next(results)
+
+    assert first.contents == {'cid1': {'user': 'user-0', 'params': {}}}
+    assert len(consumed) <= 4
+
+    assert [result.user_id for result in results] == ['user-%d' % i for i in range(1, 20)]
+    assert 1 < len(threads) <= 3
@@ -0,0 +1,129 @@
+import httpx
+import pytest
+
+from joystick import CircuitBreaker
+from joystick._async.client import AsyncClient
+from joystick.errors import BadRequestError, ServerError
+
+from .fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                        Fallback to the last known good result                  ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+def unavailable_api_responses():
+    return [
+        httpx.Response(503),
+        httpx.ConnectError('Connection refused'),
+        httpx.ReadTimeout('Timeout'),
+    ]
+
+
+@pytest.mark.parametrize("unavailable_api_response", unavailable_api_responses())
+@pytest.mark.asyncio
+async def test_last_known_good_result_is_served_when_api_is_unavailable(unavailable_api_response):
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}}),
+        unavailable_api_response,
+    ])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, fallback_to_last_known_good=True)
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+
+    # Simulate the expiration of the cached result
+    await client.clear_cache()
+
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_last_known_good_result_is_shared_with_context_clients():
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}}),
+        httpx.Response(503),
+    ])
+    client = AsyncClient(api_key=VALID_API_KEY, user_id='user', http_client=http_client, fallback_to_last_known_good=True)
+
+    assert await client.with_context().get_content('cid1') == {'key': 'value'}
+    await client.clear_cache()
+
+    assert await client.with_context().get_content('cid1') == {'key': 'value'}
+    assert await client.get_content('cid1') == {'key': 'value'}
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_last_known_good_result_is_served_when_circuit_is_open():
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}}),
+        httpx.Response(503),
+    ])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=http_client,
+        fallback_to_last_known_good=True,
+        circuit_breaker=CircuitBreaker(failure_threshold=1, recovery_timeout_seconds=60),
+    )
+
+    await client.get_content('cid1')
+
+    for _ in range(3):
+        assert await client.get_content('cid1', refresh=True) == {'key': 'value'}
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_last_known_good_result_per_content_id():
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': 'first'}, 'cid2': {'data': 'second'}}),
+        httpx.Response(503),
+    ])
+    client = AsyncClient(
+        api_key=VALID_API_KEY,
+        http_client=http_client,
+        fallback_to_last_known_good=True,
+        cache_per_content_id=True,
+    )
+
+    await client.get_contents({'cid1', 'cid2'})
+    await client.clear_cache()
+
+    assert await client.get_contents({'cid2'}) == {'cid2': 'second'}
+    with pytest.raises(ServerError):
+        await client.get_contents({'cid2', 'cid3'})
+
+
+@pytest.mark.asyncio
+async def test_no_fallback_without_option():
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}}),
+        httpx.Response(503),
+    ])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client)
+
+    await client.get_content('cid1')
+    await client.clear_cache()
+
+    with pytest.raises(ServerError):
+        await client.get_content('cid1')
+
+
+@pytest.mark.asyncio
+async def test_no_fallback_on_bad_request():
+    http_client, requests = mock_http_client([
+        httpx.Response(200, json={'cid1': {'data': {'key': 'value'}}}),
+        httpx.Response(401),
+    ])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client, fallback_to_last_known_good=True)
+
+    await client.get_content('cid1')
+    await client.clear_cache()
+
+    with pytest.raises(BadRequestError):
+        await client.get_content('cid1')
@@ -0,0 +1,90 @@
+import copy
+import json
+import pickle
+
+from httpx import Response
+import pytest
+
+from joystick import Client, FrozenDict, SyncFileCache
+from joystick._async.client import AsyncClient
+
+from .fixtures import api_response_get_contents, valid_content_ids, valid_api_key
+
+COMBINE_URL = "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true"
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                               Immutable results                                ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_immutable_results_are_shared_with_cache_without_copies(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, immutable_results=True)
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    response = await client.get_contents(content_ids=valid_content_ids)
+
+    assert isinstance(response, FrozenDict)
+    assert isinstance(response['cid1'], FrozenDict)
+    assert response == dict((key, content['data']) for key, content in json.loads(api_response_get_contents).items())
+    assert await client.get_contents(content_ids=valid_content_ids) is response
+    assert copy.deepcopy(response) is response
+
+    with pytest.raises(TypeError):
+        response['cid1'] = {}
+    with pytest.raises(TypeError):
+        response['cid1'].update({'key': 'value'})
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_results_are_mutable_by_default(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    response = await client.get_contents(content_ids=valid_content_ids)
+
+    assert not isinstance(response, FrozenDict)
+    response['cid1'] = {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_immutable_results_per_content_id(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, immutable_results=True, cache_per_content_id=True)
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    first = await client.get_contents(content_ids=valid_content_ids)
+    second = await client.get_contents(content_ids=valid_content_ids)
+
+    assert isinstance(first, FrozenDict) and isinstance(second, FrozenDict)
+    assert second['cid1'] is first['cid1']
+    assert await client.get_content('cid1') is first['cid1']
+
+
+@pytest.mark.respx()
+def test_sync_immutable_results_from_file_cache(tmp_path, respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = Client(api_key=valid_api_key, immutable_results=True, cache=SyncFileCache(str(tmp_path)))
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    response = client.get_contents(content_ids=valid_content_ids)
+    cached_response = client.get_contents(content_ids=valid_content_ids)
+
+    assert isinstance(cached_response, FrozenDict)
+    assert cached_response == response
+
+
+def test_frozen_dict_can_be_serialized():
+    frozen = FrozenDict({'list': (1, 2), 'nested': FrozenDict({'key': 'value'})})
+
+    assert json.loads(json.dumps(frozen)) == {'list': [1, 2], 'nested': {'key': 'value'}}
+
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert isinstance(unpickled, FrozenDict)
+    assert unpickled == frozen
@@ -0,0 +1,65 @@
+import json
+
+from httpx import Response
+import pytest
+
+from joystick._async.client import AsyncClient
+from joystick.json_codec import MsgspecCodec, OrjsonCodec, StandardJsonCodec
+
+from .fixtures import api_response_get_contents, valid_content_ids, valid_api_key
+
+COMBINE_URL = "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true"
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                                  JSON codecs                                   ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.fixture(params=[StandardJsonCodec, OrjsonCodec, MsgspecCodec])
+def json_codec(request):
+    try:
+        return request.param()
+    except ImportError:
+        pytest.skip('JSON library is not installed')
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+@pytest.mark.parametrize('full_response', [False, True])
+async def test_get_contents_decodes_response(json_codec, full_response, respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, json_codec=json_codec)
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    response = await client.get_contents(content_ids=valid_content_ids, full_response=full_response)
+
+    expected_response = json.loads(api_response_get_contents)
+    if not full_response:
+        expected_response = dict((key, content['data']) for key, content in expected_response.items())
+    assert response == expected_response
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_malformed_response_raises_json_error(json_codec, respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, json_codec=json_codec)
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents[:-1]))
+
+    with pytest.raises(json.decoder.JSONDecodeError):
+        await client.get_contents(content_ids=valid_content_ids)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_encodes_request_body(json_codec, respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, json_codec=json_codec, user_id='usér', params={'b': [1, 2], 'a': None})
+
+    combine_api_call = respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    await client.get_contents(content_ids=valid_content_ids)
+
+    request = combine_api_call.calls.last.request
+    assert request.headers['Content-Type'] == 'application/json'
+    assert json.loads(request.content) == {'u': 'usér', 'p': {'b': [1, 2], 'a': None}}
@@ -0,0 +1,81 @@
+import json
+
+import httpx
+import pytest
+
+from joystick import Client, LocalEvaluatorInterface
+from joystick._async.client import AsyncClient
+
+from .fixtures import mock_http_client
+
+VALID_API_KEY = 'valid api key'
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                                Local evaluation                                ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+class CountryEvaluator(LocalEvaluatorInterface):
+    def __init__(self):
+        self.calls = []
+
+    def evaluate(self, content_id, content, user_id, params, sem_ver):
+        self.calls.append((content_id, user_id))
+        return content['variants'].get(params.get('country'), content['default'])
+
+
+def respond(request):
+    content_ids = json.loads(request.url.params['c'])
+    return httpx.Response(200, json=dict(
+        (cid, {'data': {'default': 'default', 'variants': {'US': 'us', 'DE': 'de'}}}) for cid in content_ids
+    ))
+
+
+@pytest.mark.asyncio
+async def test_local_evaluation_requests_contents_once_for_all_users():
+    http_client, requests = mock_http_client([respond])
+    evaluator = CountryEvaluator()
+    client = AsyncClient(api_key=VALID_API_KEY, local_evaluator=evaluator, http_client=http_client)
+
+    us_user = client.with_context(user_id='first', params={'country': 'US'})
+    de_user = client.with_context(user_id='second', params={'country': 'DE'})
+
+    assert await us_user.get_contents({'cid1', 'cid2'}) == {'cid1': 'us', 'cid2': 'us'}
+    assert await de_user.get_contents({'cid1', 'cid2'}) == {'cid1': 'de', 'cid2': 'de'}
+    assert await client.get_content('cid1') == 'default'
+    assert await de_user.prepare({'cid1', 'cid2'}).get_contents() == {'cid1': 'de', 'cid2': 'de'}
+
+    assert len(requests) == 2
+    assert 'dynamic' not in requests[0].url.params
+    assert json.loads(requests[0].content) == {'u': '', 'p': {}}
+    assert ('cid1', 'second') in evaluator.calls
+
+
+@pytest.mark.asyncio
+async def test_local_evaluation_does_not_share_cache_with_dynamic_contents():
+    http_client, requests = mock_http_client([respond])
+    client = AsyncClient(api_key=VALID_API_KEY, http_client=http_client)
+    local_client = client.with_context()
+    local_client.local_evaluator = CountryEvaluator()
+
+    await client.get_content('cid1')
+    await local_client.get_content('cid1')
+
+    assert len(requests) == 2
+    assert requests[0].url.params['dynamic'] == 'true'
+    assert 'dynamic' not in requests[1].url.params
+
+
+def test_local_evaluator_should_implement_interface():
+    with pytest.raises(ValueError):
+        Client(api_key=VALID_API_KEY, local_evaluator=lambda *args: None)
+
+
+def test_sync_local_evaluation():
+    http_client, requests = mock_http_client([respond], httpx.Client)
+    client = Client(api_key=VALID_API_KEY, local_evaluator=CountryEvaluator(), http_client=http_client)
+
+    assert client.with_context(params={'country': 'US'}).get_content('cid1') == 'us'
+    assert client.get_content('cid1') == 'default'
+    assert len(requests) == 1
@@ -0,0 +1,128 @@
+from httpx import Response
+import pytest
+from mock import patch
+
+from joystick import Client
+from joystick._async.cache_key_builder import CacheKeyBuilder
+from joystick._async.client import AsyncClient
+
+from .fixtures import api_response_get_contents, api_response_get_contents_cache_key, valid_content_ids, valid_api_key
+
+COMBINE_URL = "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true"
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                            Prepared content handles                            ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_prepared_handle_uses_same_cache_as_get_contents(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents, api_response_get_contents_cache_key):
+    client = AsyncClient(api_key=valid_api_key)
+
+    combine_api_call = respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    handle = client.prepare(valid_content_ids)
+    assert handle.content_ids == ['cid1', 'cid2']
+
+    with patch.object(client.cache, 'set', wraps=client.cache.set) as cache_set:
+        response = await handle.get_contents()
+
+    cache_set.assert_called_once_with(key=api_response_get_contents_cache_key, value=response, cache_expiration_seconds=300)
+    assert await client.get_contents(content_ids=valid_content_ids) == response
+    assert await handle.get_contents() == response
+    assert combine_api_call.call_count == 1
+
+    await handle.get_contents(refresh=True)
+    assert combine_api_call.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_prepared_handle_follows_client_context_changes(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+
+    combine_api_call = respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    handle = client.prepare(valid_content_ids)
+    await handle.get_contents()
+
+    client.params['param'] = 'value'
+    await handle.get_contents()
+    assert combine_api_call.call_count == 2
+
+    client.user_id = 'user'
+    await handle.get_contents()
+    await handle.get_contents()
+    assert combine_api_call.call_count == 3
+
+    client.params = {}
+    client.user_id = ''
+    await handle.get_contents()
+    assert combine_api_call.call_count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_prepared_handle_follows_client_serialized_option(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+
+    combine_api_call = respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+    combine_api_call_serialized = respx_mock.post(COMBINE_URL + "&responseType=serialized").mock(
+        return_value=Response(200, content=api_response_get_contents)
+    )
+
+    handle = client.prepare(valid_content_ids)
+    await handle.get_contents()
+
+    client.serialized = True
+    await handle.get_contents()
+
+    assert combine_api_call.call_count == 1
+    assert combine_api_call_serialized.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_prepare_validates_options(valid_api_key):
+    client = AsyncClient(api_key=valid_api_key)
+
+    with pytest.raises(AssertionError):
+        client.prepare(['cid1'])
+    with pytest.raises(AssertionError):
+        client.prepare(set())
+    with pytest.raises(AssertionError):
+        client.prepare({'cid1'}, serialized='yes')
+
+
+@pytest.mark.respx()
+def test_sync_prepared_handle_serves_hits_from_cache(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = Client(api_key=valid_api_key, cache_per_content_id=True)
+
+    combine_api_call = respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    handle = client.prepare(valid_content_ids)
+    response = handle.get_contents()
+
+    assert handle.get_contents() == response
+    assert client.get_contents(content_ids=valid_content_ids) == response
+    assert combine_api_call.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_prepared_handle_reuses_cache_key_until_context_changes(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, params={'tags': ['a', 'b'], 'limits': {'max': 10}})
+
+    respx_mock.post(COMBINE_URL).mock(return_value=Response(200, content=api_response_get_contents))
+
+    handle = client.prepare(valid_content_ids)
+    with patch('joystick._async.client.CacheKeyBuilder.build', autospec=True, side_effect=CacheKeyBuilder.build) as build:
+        for _ in range(3):
+            await handle.get_contents()
+        assert build.call_count == 1
+
+        client.params['tags'] = ['c']
+        await handle.get_contents()
+        await handle.get_contents()
+        assert build.call_count == 2
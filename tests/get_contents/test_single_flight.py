@@ -0,0 +1,114 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from httpx import Response
+import pytest
+
+from joystick import Client
+from joystick._async.client import AsyncClient
+from joystick.errors.api import ServerError
+
+from .fixtures import api_response_get_contents, valid_content_ids, valid_api_key
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                           Request coalescing (single-flight)                   ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_concurrent_misses_share_one_request(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    responses = await asyncio.gather(*[client.get_contents(content_ids=valid_content_ids) for _ in range(10)])
+
+    assert combine_api_call.call_count == 1
+    assert all(response == responses[0] for response in responses)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_concurrent_misses_for_different_keys_are_not_shared(respx_mock, valid_api_key, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+    combine_api_call_serialized = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true&responseType=serialized",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    await asyncio.gather(
+        client.get_contents(content_ids={'cid1', 'cid2'}),
+        client.get_contents(content_ids={'cid1', 'cid2'}, serialized=True),
+    )
+
+    assert combine_api_call.call_count == 1
+    assert combine_api_call_serialized.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_concurrent_misses_share_the_error(respx_mock, valid_api_key, valid_content_ids):
+    client = AsyncClient(api_key=valid_api_key)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(500, content="Internal Server Error"))
+
+    results = await asyncio.gather(
+        *[client.get_contents(content_ids=valid_content_ids) for _ in range(5)],
+        return_exceptions=True,
+    )
+
+    assert combine_api_call.call_count == 1
+    assert all(isinstance(result, ServerError) for result in results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_cancelled_caller_does_not_cancel_shared_request(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key)
+
+    async def slow_response(request):
+        await asyncio.sleep(0.05)
+        return Response(200, content=api_response_get_contents)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=slow_response)
+
+    first = asyncio.ensure_future(client.get_contents(content_ids=valid_content_ids))
+    second = asyncio.ensure_future(client.get_contents(content_ids=valid_content_ids))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    response = await second
+
+    assert combine_api_call.call_count == 1
+    assert set(response.keys()) == valid_content_ids
+
+
+@pytest.mark.respx()
+def test_sync_get_contents_concurrent_misses_share_one_request(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = Client(api_key=valid_api_key)
+
+    def slow_response(request):
+        time.sleep(0.1)
+        return Response(200, content=api_response_get_contents)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=slow_response)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(lambda _: client.get_contents(content_ids=valid_content_ids), range(8)))
+
+    assert combine_api_call.call_count == 1
+    assert all(response == responses[0] for response in responses)
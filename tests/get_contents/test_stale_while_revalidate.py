@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+
+from httpx import Response
+import pytest
+from mock import patch
+
+from joystick import Client
+from joystick._async.client import AsyncClient
+
+from .fixtures import api_response_get_contents, mock_http_client, valid_content_ids, valid_api_key
+
+
+def updated_response(api_response_get_contents):
+    response = json.loads(api_response_get_contents)
+    response['cid1']['data']['title'] = 'Updated title'
+    return json.dumps(response)
+
+
+# ! ||--------------------------------------------------------------------------------||
+# ! ||                           Stale while revalidate                               ||
+# ! ||--------------------------------------------------------------------------------||
+
+
+def test_wrong_stale_while_revalidate_seconds(valid_api_key):
+    with pytest.raises(ValueError):
+        AsyncClient(api_key=valid_api_key, stale_while_revalidate_seconds=-1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_serves_stale_result_and_revalidates_in_background(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, cache_expiration_seconds=10, stale_while_revalidate_seconds=60)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=[
+        Response(200, content=api_response_get_contents),
+        Response(200, content=updated_response(api_response_get_contents)),
+    ])
+
+    response_first = await client.get_contents(content_ids=valid_content_ids)
+
+    with patch('joystick._async.client.time', return_value=time.time() + 30):
+        response_stale = await client.get_contents(content_ids=valid_content_ids)
+
+        assert response_stale == response_first
+
+        # Let the background refresh complete
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    assert combine_api_call.call_count == 2
+
+    response_revalidated = await client.get_contents(content_ids=valid_content_ids)
+
+    assert combine_api_call.call_count == 2
+    assert response_revalidated['cid1']['title'] == 'Updated title'
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_fresh_result_is_not_revalidated(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, cache_expiration_seconds=10, stale_while_revalidate_seconds=60)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    await client.get_contents(content_ids=valid_content_ids)
+    await client.get_contents(content_ids=valid_content_ids)
+    await asyncio.sleep(0)
+
+    assert combine_api_call.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.respx()
+async def test_get_contents_failed_revalidation_keeps_serving_stale_result(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = AsyncClient(api_key=valid_api_key, cache_expiration_seconds=10, stale_while_revalidate_seconds=60)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=[
+        Response(200, content=api_response_get_contents),
+        Response(500, content="Internal Server Error"),
+    ])
+
+    response_first = await client.get_contents(content_ids=valid_content_ids)
+
+    with patch('joystick._async.client.time', return_value=time.time() + 30):
+        response_stale = await client.get_contents(content_ids=valid_content_ids)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert combine_api_call.call_count == 2
+        assert response_stale == response_first
+        assert await client.get_contents(content_ids=valid_content_ids) == response_first
+
+
+@pytest.mark.asyncio
+@patch('joystick._async.cache.in_memory.InMemoryCache')
+@pytest.mark.respx()
+async def test_get_contents_keeps_stale_result_in_cache_for_revalidation_window(CacheMock, respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    from mock import AsyncMock
+
+    cache = CacheMock()
+    cache.set = AsyncMock()
+    cache.get = AsyncMock(return_value=None)
+
+    client = AsyncClient(api_key=valid_api_key, cache=cache, cache_expiration_seconds=10, stale_while_revalidate_seconds=60)
+
+    respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(return_value=Response(200, content=api_response_get_contents))
+
+    await client.get_contents(content_ids=valid_content_ids)
+
+    assert cache.set.call_args.kwargs['cache_expiration_seconds'] == 70
+
+
+@pytest.mark.respx()
+def test_sync_get_contents_revalidates_in_worker_thread(respx_mock, valid_api_key, valid_content_ids, api_response_get_contents):
+    client = Client(api_key=valid_api_key, cache_expiration_seconds=10, stale_while_revalidate_seconds=60)
+
+    combine_api_call = respx_mock.post(
+        "https://api.getjoystick.com/api/v1/combine/?c=[\"cid1\", \"cid2\"]&dynamic=true",
+    ).mock(side_effect=[
+        Response(200, content=api_response_get_contents),
+        Response(200, content=updated_response(api_response_get_contents)),
+    ])
+
+    response_first = client.get_contents(content_ids=valid_content_ids)
+
+    with patch('joystick._sync.client.time', return_value=time.time() + 30):
+        assert client.get_contents(content_ids=valid_content_ids) == response_first
+
+    for _ in range(100):
+        response = client.get_contents(content_ids=valid_content_ids)
+        if response['cid1']['title'] == 'Updated title':
+            break
+        time.sleep(0.01)
+
+    assert combine_api_call.call_count == 2
+    assert response['cid1']['title'] == 'Updated title'
+
+
+@pytest.mark.asyncio
+async def test_aclose_cancels_background_revalidation(valid_api_key, valid_content_ids, api_response_get_contents):
+    revalidation_started = asyncio.Event()
+    revalidation_cancelled = asyncio.Event()
+
+    async def respond_never(request):
+        revalidation_started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            revalidation_cancelled.set()
+            raise
+
+    http_client, requests = mock_http_client([Response(200, content=api_response_get_contents), respond_never])
+    client = AsyncClient(api_key=valid_api_key, cache_expiration_seconds=10, stale_while_revalidate_seconds=60, http_client=http_client)
+
+    response_first = await client.get_contents(content_ids=valid_content_ids)
+
+    with patch('joystick._async.client.time', return_value=time.time() + 30):
+        assert await client.get_contents(content_ids=valid_content_ids) == response_first
+
+    await asyncio.wait_for(revalidation_started.wait(), 1)
+    await asyncio.wait_for(client.aclose(), 1)
+
+    assert revalidation_cancelled.is_set()
+    assert client._AsyncClient__single_flight._AsyncSingleFlight__in_flight == {}
+    assert len(requests) == 2
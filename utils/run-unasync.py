@@ -11,6 +11,12 @@ def main():
         # - Import from `httpx`, which uses terms `AsyncClient` for async and `Client` for sync
         # - Our "export", where we use the same terms
         "AsyncClient": "Client",
+        # Same naming as `httpx` uses for closing the clients
+        "aclose": "close",
+        # Helpers from `joystick._concurrency`
+        "async_sleep": "sync_sleep",
+        "async_run_blocking": "sync_run_blocking",
+        "async_map_bounded": "sync_map_bounded",
     }
     rules = [
         unasync.Rule(